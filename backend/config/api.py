@@ -1,9 +1,10 @@
-from django.contrib.auth import get_user_model
+from typing import cast
+
 from django.http import HttpRequest, JsonResponse
 from events.api import router as events_router
 from ninja import NinjaAPI
-from ninja.security import HttpBearer
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from ninja.errors import AuthorizationError
+from notifications.api import router as notifications_router
 from rest_framework_simplejwt.exceptions import (
     AuthenticationFailed,
     InvalidToken,
@@ -11,21 +12,8 @@ from rest_framework_simplejwt.exceptions import (
 from users.api import jwt_router
 from users.api import router as users_router
 
-
-User = get_user_model()
-
-
-class AuthJWT(HttpBearer):
-    """Authentication class that implements JWT token validation."""
-
-    def authenticate(self, request: HttpRequest, token: str) -> User | None:  # type: ignore
-        """Validates the JWT token provided in the Authorization header."""
-        authenticator = JWTAuthentication()
-        validated = authenticator.authenticate(request)
-        if not validated:
-            return None
-        user, _ = validated
-        return user
+from config import metrics
+from config.auth import AuthClaims, AuthJWT, Principal
 
 
 api = NinjaAPI()
@@ -52,3 +40,20 @@ api.add_router(
     events_router,
     auth=AuthJWT(),
 )
+api.add_router(
+    '/notifications/',
+    notifications_router,
+    auth=AuthClaims(),
+)
+
+
+@api.get('/metrics/', auth=AuthClaims(), response=metrics.Snapshot)
+def metrics_snapshot(request: HttpRequest) -> metrics.Snapshot:
+    """
+    Application metrics (booking lock waits, retries, conflicts, etc.).
+
+    Available only for staff users.
+    """
+    if not cast(Principal, request.auth).is_staff:  # type: ignore
+        raise AuthorizationError(403, 'Only the staff can read the metrics.')
+    return metrics.snapshot()
@@ -0,0 +1,75 @@
+from typing import NamedTuple
+
+from django.contrib.auth.models import User
+from django.http import HttpRequest
+from ninja.security import HttpBearer
+from rest_framework_simplejwt.exceptions import (
+    AuthenticationFailed,
+    InvalidToken,
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import (
+    AccessToken,
+    RefreshToken,
+    TokenError,
+)
+from users import cache
+
+
+class Principal(NamedTuple):
+    """The id and the staff status of the authenticated user."""
+
+    id: int
+    is_staff: bool
+
+
+class AuthJWT(HttpBearer):
+    """
+    JWT authentication of the user, resolved from the cache of the users
+    instead of the database.
+    """
+
+    def authenticate(self, request: HttpRequest, token: str) -> User:
+        """Validates the JWT token provided in the Authorization header."""
+        return _get_active_user(_validate(token))
+
+
+class AuthClaims(HttpBearer):
+    """
+    JWT authentication of the endpoints that need only the `id` and the
+    `is_staff` of the user. The user is still resolved from the cache of
+    the users, so a deactivated one is rejected once it is invalidated.
+    """
+
+    def authenticate(self, request: HttpRequest, token: str) -> Principal:
+        """Validates the JWT token provided in the Authorization header."""
+        user = _get_active_user(_validate(token))
+        return Principal(id=user.pk, is_staff=user.is_staff)
+
+
+def refresh_access(refresh_token: str) -> AccessToken:
+    """
+    A new access token of the user. Raises TokenError if the refresh token
+    is invalid or the user is deleted or inactive.
+    """
+    refresh = RefreshToken(refresh_token)  # type: ignore
+    user = cache.get_user(int(refresh[api_settings.USER_ID_CLAIM]))
+    if user is None or not user.is_active:
+        raise TokenError('The user is not found or inactive')
+    return refresh.access_token
+
+
+def _get_active_user(access: AccessToken) -> User:
+    user = cache.get_user(int(access[api_settings.USER_ID_CLAIM]))
+    if user is None:
+        raise AuthenticationFailed('User not found')
+    if not user.is_active:
+        raise AuthenticationFailed('User is inactive')
+    return user
+
+
+def _validate(token: str) -> AccessToken:
+    try:
+        return AccessToken(token)  # type: ignore
+    except TokenError as error:
+        raise InvalidToken(str(error)) from error
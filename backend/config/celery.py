@@ -1,9 +1,13 @@
 import os
+from datetime import timedelta
 
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import before_task_publish, task_prerun
 from kombu import Exchange, Queue
 
+from config import queue_lag
+
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
@@ -11,39 +15,107 @@ app = Celery('api_events_celery')
 app.config_from_object('django.conf:settings', force=True, namespace='CELERY')
 
 DEFAULT = 'default'
+# The lanes of the task classes, every one is served by its own workers
+# (see entrypoint.sh): the confirmations a user waits for never queue
+# behind a bulk fan-out or a maintenance sweep.
 URGENT = 'urgent'
+BULK = 'bulk'
+MAINTENANCE = 'maintenance'
+TASK = 'task'
+SCHEDULE = 'schedule'
+# The Valkey broker serves the lower values first, 0 is the highest
+# (its default priority steps are 0, 3, 6 and 9).
+HIGH_PRIORITY = 0
+NORMAL_PRIORITY = 3
+LOW_PRIORITY = 6
+
+
+def route(
+    queue: str, routing_key: str, priority: int = NORMAL_PRIORITY
+) -> dict[str, str | int]:
+    return {
+        'queue': queue,
+        'routing_key': f'{queue}.{routing_key}',
+        'priority': priority,
+    }
 
 
 app.conf.task_default_queue = DEFAULT
+app.conf.task_default_priority = NORMAL_PRIORITY
 app.conf.task_queues = (
     Queue(DEFAULT, Exchange(DEFAULT), routing_key='task.#'),
     Queue(URGENT, Exchange(URGENT), routing_key=f'{URGENT}.#'),
+    Queue(BULK, Exchange(BULK), routing_key=f'{BULK}.#'),
+    Queue(MAINTENANCE, Exchange(MAINTENANCE), routing_key=f'{MAINTENANCE}.#'),
 )
 
 app.conf.task_routes = {
-    'notifications.tasks.*': {
-        'queue': URGENT,
-        'routing_key': f'{URGENT}.notification',
-    },
-    'events.tasks.notify_upcoming_events': {
-        'queue': URGENT,
-        'routing_key': f'{URGENT}.reminder',
-    },
-    'events.tasks.finish_expired_events': {
-        'queue': DEFAULT,
-        'routing_key': 'task.status_update',
-    },
+    # Interactive: the outbox relay publishes the booking confirmations.
+    'notifications.tasks.send_booking_confirmation': route(
+        URGENT, 'confirmation', HIGH_PRIORITY
+    ),
+    'notifications.tasks.send_booking_confirmations': route(
+        URGENT, 'confirmation', HIGH_PRIORITY
+    ),
+    'notifications.tasks.relay_outbox': route(URGENT, 'outbox', HIGH_PRIORITY),
+    'notifications.tasks.send_event_cancelled': route(URGENT, 'notification'),
+    'notifications.tasks.send_digest': route(URGENT, 'digest', LOW_PRIORITY),
+    # Bulk: the notifications to all the participants and the backlog.
+    'notifications.tasks.event_reminder': route(BULK, 'reminder'),
+    'notifications.tasks.fan_out_notification': route(BULK, 'fan_out'),
+    'notifications.tasks.notify_event_cancelled': route(BULK, 'cancellation'),
+    'notifications.tasks.notify_participants_chunk': route(BULK, 'fan_out'),
+    'notifications.tasks.summarize_fan_out': route(BULK, 'fan_out'),
+    'notifications.tasks.process_pending_notifications': route(
+        BULK, 'dispatch', LOW_PRIORITY
+    ),
+    'notifications.tasks.replay_dead_notifications': route(
+        BULK, 'replay', LOW_PRIORITY
+    ),
+    # Maintenance: the periodic sweeps nobody waits for.
+    'events.tasks.notify_upcoming_events': route(MAINTENANCE, 'reminder'),
+    'events.tasks.finish_expired_events': route(MAINTENANCE, 'status_update'),
+    'events.tasks.reconcile_seats_booked': route(MAINTENANCE, 'reconcile'),
+    'notifications.tasks.maintain_notification_partitions': route(
+        MAINTENANCE, 'partitions'
+    ),
+    'notifications.tasks.*': route(URGENT, 'notification'),
 }
 
 app.conf.beat_schedule = {
+    # The reminders due soon are scheduled with the events, the sweep
+    # schedules the later ones (EVENTS_REMINDER_HORIZON ahead) and catches
+    # the missed ones.
     'notify_upcoming_events': {
-        'task': 'events.tasks.notify_upcoming_events',
-        'schedule': crontab(minute=0, hour='*'),
+        TASK: 'events.tasks.notify_upcoming_events',
+        SCHEDULE: crontab(minute='*/10'),
     },
     'finish_expired_events': {
-        'task': 'events.tasks.finish_expired_events',
-        'schedule': crontab(minute=0, hour='*/3'),
+        TASK: 'events.tasks.finish_expired_events',
+        SCHEDULE: crontab(minute=0, hour='*/3'),
+    },
+    # The drift left by raw SQL or bulk changes bypassing the counters.
+    'reconcile_seats_booked': {
+        TASK: 'events.tasks.reconcile_seats_booked',
+        SCHEDULE: crontab(minute=15, hour=4),
+    },
+    'process_pending_notifications': {
+        TASK: 'notifications.tasks.process_pending_notifications',
+        SCHEDULE: crontab(minute='*'),
+    },
+    'maintain_notification_partitions': {
+        TASK: 'notifications.tasks.maintain_notification_partitions',
+        SCHEDULE: crontab(minute=30, hour=3),
+    },
+    # The outbox latency: the tasks of the committed changes are published
+    # within a couple of seconds.
+    'relay_outbox': {
+        TASK: 'notifications.tasks.relay_outbox',
+        SCHEDULE: timedelta(seconds=2),
     },
 }
 
 app.autodiscover_tasks()
+
+before_task_publish.connect(queue_lag.stamp_published_at)
+task_prerun.connect(queue_lag.record_lag)
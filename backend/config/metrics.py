@@ -0,0 +1,118 @@
+import logging
+from typing import Any
+
+from django.core.cache import cache
+
+
+logger = logging.getLogger(__name__)
+
+METRICS_KEY_PREFIX = 'metrics'
+COUNT = 'count'
+SUM = 'sum'
+
+registry: dict[str, 'Metric'] = {}
+
+Snapshot = dict[str, dict[str, Any]]
+
+
+class Metric:
+    """
+    Base class of the application metrics.
+
+    The values are kept in the default Django cache, so all the processes
+    sharing the cache (gunicorn and celery workers) report the same numbers.
+    A broken cache never breaks the measured code path.
+    """
+
+    def __init__(self, name: str, description: str) -> None:
+        self.name = name
+        self.description = description
+        registry[name] = self
+
+    def collect(self) -> dict[str, Any]:
+        raise NotImplementedError
+
+    def _key(self, suffix: str) -> str:
+        return f'{METRICS_KEY_PREFIX}:{self.name}:{suffix}'
+
+    def _incr(self, suffix: str, amount: int) -> None:
+        key = self._key(suffix)
+        try:
+            if not cache.add(key, amount, timeout=None):
+                cache.incr(key, amount)
+        except Exception:
+            logger.warning('Unable to update the metric %s', key, exc_info=True)
+
+
+class Counter(Metric):
+    """Monotonically increasing counter."""
+
+    def inc(self, amount: int = 1) -> None:
+        self._incr('total', amount)
+
+    def collect(self) -> dict[str, Any]:
+        return {'total': cache.get(self._key('total'), 0)}
+
+
+class Histogram(Metric):
+    """Histogram of durations in milliseconds with fixed bucket bounds."""
+
+    buckets = (
+        1,
+        5,
+        10,
+        25,
+        50,
+        100,
+        250,
+        500,
+        1000,
+        2500,
+        5000,
+        10000,
+    )
+
+    def observe(self, value_ms: float) -> None:
+        bucket = next(
+            (str(bound) for bound in self.buckets if value_ms <= bound),
+            'inf',
+        )
+        self._incr(COUNT, 1)
+        self._incr(SUM, round(value_ms))
+        self._incr(f'le_{bucket}', 1)
+
+    def collect(self) -> dict[str, Any]:
+        bounds = [str(bound) for bound in self.buckets] + ['inf']
+        stored = cache.get_many(
+            [self._key(COUNT), self._key(SUM)]
+            + [self._key(f'le_{bound}') for bound in bounds]
+        )
+        count = stored.get(self._key(COUNT), 0)
+        buckets = {
+            bound: stored.get(self._key(f'le_{bound}'), 0) for bound in bounds
+        }
+        return {
+            'count': count,
+            'sum_ms': stored.get(self._key(SUM), 0),
+            'buckets': buckets,
+            'p50_ms': self._quantile(buckets, count, 0.5),
+            'p99_ms': self._quantile(buckets, count, 0.99),
+        }
+
+    def _quantile(
+        self, buckets: dict[str, int], count: int, quantile: float
+    ) -> str | None:
+        """Upper bucket bound that covers the quantile of observations."""
+        if not count:
+            return None
+        observed = 0
+        for bound, bucket_count in buckets.items():
+            observed += bucket_count
+            if observed >= count * quantile:
+                return bound
+        return 'inf'
+
+
+def snapshot() -> Snapshot:
+    """Current values of all the registered metrics."""
+    return {name: metric.collect() for name, metric in registry.items()}
@@ -0,0 +1,162 @@
+import binascii
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import date
+from decimal import Decimal
+from typing import Any
+from uuid import UUID
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Model, Q, QuerySet  # noqa: WPS347
+from ninja import Field, Schema
+from ninja.errors import HttpError
+from ninja.pagination import PaginationBase
+
+
+MAX_LIMIT = 100
+PK = 'pk'
+DESCENDING = '-'
+
+
+def get_ordering(queryset: QuerySet) -> list[str]:
+    """
+    Ordering of the queryset made unique by the trailing primary key.
+
+    Only field and annotation names are supported, because the keyset
+    condition is built from them.
+    """
+    ordering = list(queryset.query.order_by) or list(
+        queryset.model._meta.ordering  # noqa: SLF001
+    )
+    for key in ordering:
+        if not isinstance(key, str):
+            raise TypeError(f'Keyset pagination cannot order by {key!r}')
+    if not {PK, '-pk', 'id', '-id'} & set(ordering):
+        ordering.append(PK)
+    return ordering
+
+
+def compare(key: str, cursor_value: Any, *, inclusive: bool = False) -> Q:
+    """Condition for the `key` to be after `cursor_value` in its order."""
+    lookup = 'lt' if key.startswith(DESCENDING) else 'gt'
+    if inclusive:
+        lookup = f'{lookup}e'
+    return Q(**{f'{key.removeprefix(DESCENDING)}__{lookup}': cursor_value})
+
+
+def keyset_condition(ordering: list[str], cursor_values: list[Any]) -> Q:
+    """
+    Condition selecting the rows located after the given ordering values.
+
+    (a, b, pk) > (x, y, z) is expanded into
+    a >= x AND (a > x OR (a = x AND b > y) OR (a = x AND b = y AND pk > z)),
+    the leading range lets the database start from the cursor position
+    in an index instead of filtering from the beginning of it.
+    """
+    condition = Q()
+    equal = Q()
+    for key, cursor_value in zip(ordering, cursor_values, strict=True):
+        condition |= equal & compare(key, cursor_value)
+        equal &= Q(**{key.removeprefix(DESCENDING): cursor_value})
+    return compare(ordering[0], cursor_values[0], inclusive=True) & condition
+
+
+def serialize_cursor_value(cursor_value: Any) -> str:
+    """
+    Lossless serialization of the ordering values.
+
+    Unlike DjangoJSONEncoder, the microseconds of datetimes are kept,
+    otherwise the cursor would not match the row it was taken from.
+    """
+    if isinstance(cursor_value, date):
+        return cursor_value.isoformat()
+    if isinstance(cursor_value, Decimal | UUID):
+        return str(cursor_value)
+    raise TypeError(f'Unsupported cursor value: {cursor_value!r}')
+
+
+def encode_cursor(ordering: list[str], instance: Model) -> str:
+    cursor_values = [
+        getattr(instance, key.removeprefix(DESCENDING)) for key in ordering
+    ]
+    payload = json.dumps(
+        {'o': ordering, 'v': cursor_values}, default=serialize_cursor_value
+    )
+    return urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(ordering: list[str], cursor: str) -> list[Any]:
+    try:
+        payload = json.loads(urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as error:
+        raise HttpError(400, 'Invalid cursor') from error
+    if not isinstance(payload, dict) or payload.get('o') != ordering:
+        raise HttpError(400, 'The cursor does not match the ordering')
+    cursor_values = payload.get('v')
+    if not isinstance(cursor_values, list) or len(cursor_values) != len(
+        ordering
+    ):
+        raise HttpError(400, 'Invalid cursor')
+    return cursor_values
+
+
+class KeysetPagination(PaginationBase):
+    """
+    Cursor (keyset) pagination over the ordering of the queryset.
+
+    The opaque cursor keeps the ordering values of the last item of the
+    page and the next page starts right after them with a WHERE condition
+    instead of OFFSET. It is stable under inserts and deep pages cost the
+    same as the first one.
+    """
+
+    class Input(Schema):  # noqa: WPS431
+        cursor: str | None = None
+        limit: int = Field(
+            settings.NINJA_PAGINATION_PER_PAGE, ge=1, le=MAX_LIMIT
+        )
+        with_total: bool = Field(
+            default=False,
+            description='Add the estimated (not exact) number of items.',
+        )
+
+    class Output(Schema):  # noqa: WPS431
+        items: list[Any]  # noqa: WPS110
+        next: str | None = None
+        estimated_total: int | None = None
+
+    def paginate_queryset(
+        self,
+        queryset: QuerySet,
+        pagination: Input,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        ordering = get_ordering(queryset)
+        page = queryset.order_by(*ordering)
+        if pagination.cursor:
+            cursor_values = decode_cursor(ordering, pagination.cursor)
+            page = page.filter(keyset_condition(ordering, cursor_values))
+        page_items = list(page[: pagination.limit + 1])
+        next_cursor = None
+        if len(page_items) > pagination.limit:
+            page_items = page_items[: pagination.limit]
+            next_cursor = encode_cursor(ordering, page_items[-1])
+        return {
+            'items': page_items,
+            'next': next_cursor,
+            'estimated_total': (
+                self._estimate_count(queryset)
+                if pagination.with_total
+                else None
+            ),
+        }
+
+    def _estimate_count(self, queryset: QuerySet) -> int:
+        """
+        Planner estimation of the number of rows instead of an exact COUNT.
+        """
+        if connection.vendor != 'postgresql':
+            return self._items_count(queryset)
+        plan = json.loads(queryset.order_by().explain(format='json'))
+        return int(plan[0]['Plan']['Plan Rows'])
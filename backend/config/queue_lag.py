@@ -0,0 +1,64 @@
+import logging
+import time
+from datetime import datetime
+from typing import Any
+
+from celery import Task
+from celery.app.task import Context
+from django.conf import settings
+from redis import RedisError
+
+from config.valkey import get_client
+
+
+logger = logging.getLogger(__name__)
+
+PUBLISHED_AT = 'published_at'
+LAG_KEY = 'celery:lag:{queue}'
+
+
+def stamp_published_at(headers: dict[str, Any], **kwargs: Any) -> None:
+    """Stamps the message with the time it is published at."""
+    headers[PUBLISHED_AT] = time.time()
+
+
+def record_lag(task: Task, **kwargs: Any) -> None:
+    """
+    Records the time (ms) the task waited in its queue, from the publishing
+    (or its ETA) to the start. The latest QUEUE_LAG_SAMPLES of every queue
+    are kept in Valkey.
+    """
+    published_at = getattr(task.request, PUBLISHED_AT, None)
+    if published_at is None or settings.QUEUE_LAG_SAMPLES <= 0:
+        return
+    if task.request.eta:
+        published_at = max(
+            published_at, datetime.fromisoformat(task.request.eta).timestamp()
+        )
+    key = LAG_KEY.format(queue=_get_queue(task.request))
+    lag_ms = (time.time() - published_at) * 1000
+    try:
+        with get_client().pipeline(transaction=False) as pipeline:
+            pipeline.lpush(key, round(lag_ms, 1))
+            pipeline.ltrim(key, 0, settings.QUEUE_LAG_SAMPLES - 1)
+            pipeline.execute()
+    except RedisError:
+        logger.warning('Unable to record the queue lag', exc_info=True)
+
+
+def get_lags(queue: str) -> list[float]:
+    """The latest lags (ms) of the tasks of the queue, newest first."""
+    raw_lags = get_client().lrange(LAG_KEY.format(queue=queue), 0, -1)
+    return [float(lag) for lag in raw_lags]  # type: ignore
+
+
+def reset_lags(queues: list[str]) -> None:
+    get_client().delete(*(LAG_KEY.format(queue=queue) for queue in queues))
+
+
+def _get_queue(request: Context) -> str:
+    # The lanes are published to the exchanges named after their queues.
+    delivery_info = request.delivery_info or {}
+    return str(
+        delivery_info.get('exchange') or delivery_info.get('routing_key')
+    )
@@ -26,10 +26,30 @@ config = {
     'DB_PASSWORD_ROOT': os.environ.get('DB_PASSWORD_ROOT'),
     'DB_HOST': os.environ.get('DB_HOST'),
     'DB_PORT': os.environ.get('DB_PORT'),
+    'CACHE_URL': os.environ.get('CACHE_URL'),
+    'CACHE_TIMEOUT': os.environ.get('CACHE_TIMEOUT'),
+    'VALKEY_URL': os.environ.get('VALKEY_URL'),
+    'HOLD_TTL': os.environ.get('HOLD_TTL'),
     'CELERY_BROKER_URL': os.environ.get('CELERY_BROKER_URL'),
     'CELERY_RESULT_BACKEND': os.environ.get('CELERY_RESULT_BACKEND'),
     'GRPC_SERVER_HOST': os.environ.get('GRPC_SERVER_HOST'),
     'GRPC_SERVER_PORT': os.environ.get('GRPC_SERVER_PORT'),
+    'GRPC_CHANNEL_POOL_SIZE': os.environ.get('GRPC_CHANNEL_POOL_SIZE'),
+    'GRPC_KEEPALIVE_TIME_MS': os.environ.get('GRPC_KEEPALIVE_TIME_MS'),
+    'GRPC_MAX_IN_FLIGHT': os.environ.get('GRPC_MAX_IN_FLIGHT'),
+    'GRPC_CALL_TIMEOUT': os.environ.get('GRPC_CALL_TIMEOUT'),
+    'BOOKING_LOCK_TIMEOUT_MS': os.environ.get('BOOKING_LOCK_TIMEOUT_MS'),
+    'BOOKING_LOCK_RETRIES': os.environ.get('BOOKING_LOCK_RETRIES'),
+    'SEARCH_CONFIG': os.environ.get('SEARCH_CONFIG'),
+    'NOTIFICATIONS_RETENTION_MONTHS': os.environ.get(
+        'NOTIFICATIONS_RETENTION_MONTHS'
+    ),
+    'NOTIFICATIONS_DIGEST_WINDOW': os.environ.get(
+        'NOTIFICATIONS_DIGEST_WINDOW'
+    ),
+    'NOTIFICATIONS_IMMEDIATE_TYPES': os.environ.get(
+        'NOTIFICATIONS_IMMEDIATE_TYPES'
+    ),
 }
 
 
@@ -49,6 +69,7 @@ INSTALLED_APPS = [
     'django.contrib.postgres',
     'events.apps.EventsConfig',
     'notifications.apps.NotificationsConfig',
+    'users.apps.UsersConfig',
     'django_celery_results',
     'django_celery_beat',
 ]
@@ -130,6 +151,36 @@ SIMPLE_JWT = {
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
+# The users resolved from the access tokens: the entries of the LRU of every
+# process, the time (s) they are trusted without asking Valkey and the time
+# (s) they are kept in Valkey, it bounds the staleness of the users changed
+# without the invalidation (see users.cache.invalidate_users).
+AUTH_USER_CACHE_SIZE = 1024
+AUTH_USER_LOCAL_TTL = 5
+AUTH_USER_CACHE_TIMEOUT = 300
+
+# The cached events are invalidated by bumping their version keys, so the
+# cache must be shared by all the processes: without CACHE_URL every process
+# has its own local memory cache (fine for the development only) and
+# serves the events changed by the others until EVENTS_CACHE_TIMEOUT.
+CACHES = {
+    'default': (
+        {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': config.get('CACHE_URL'),
+        }
+        if config.get('CACHE_URL')
+        else {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+    ),
+}
+
+# Seconds to keep the cached event payloads and list pages.
+EVENTS_CACHE_TIMEOUT = int(config.get('CACHE_TIMEOUT') or '60')
+
+VALKEY_URL = config.get('VALKEY_URL') or 'redis://localhost:6379/2'
+
+# Seconds to keep the seats held before the booking is confirmed.
+EVENTS_HOLD_TTL = int(config.get('HOLD_TTL') or '300')
 
 
 CELERY_BROKER_URL = config.get('CELERY_BROKER_URL')
@@ -141,6 +192,69 @@ CELERY_TIMEZONE = TIME_ZONE
 CELERY_ENABLE_UTC = True
 CELERY_CACHE_BACKEND = 'django-cache'
 CELERY_RESULT_EXTENDED = True
+# The latest queue lags of the tasks kept for every queue, 0 disables them.
+QUEUE_LAG_SAMPLES = 1000
 
 GRPC_SERVER_HOST = config.get('GRPC_SERVER_HOST') or 'localhost'
 GRPC_SERVER_PORT = int(config.get('GRPC_SERVER_PORT') or '50051')
+# Channels kept open by every worker process, the keepalive pings must be
+# permitted by the server with at least the same interval.
+GRPC_CHANNEL_POOL_SIZE = int(config.get('GRPC_CHANNEL_POOL_SIZE') or '2')
+GRPC_KEEPALIVE_TIME_MS = int(config.get('GRPC_KEEPALIVE_TIME_MS') or '30000')
+GRPC_KEEPALIVE_TIMEOUT_MS = 10000
+# Concurrent calls of the async client and the deadline of every unary
+# call (s).
+GRPC_MAX_IN_FLIGHT = int(config.get('GRPC_MAX_IN_FLIGHT') or '100')
+GRPC_CALL_TIMEOUT = float(config.get('GRPC_CALL_TIMEOUT') or '5')
+# The deadline of a stream grows by this time (s) for every notification.
+GRPC_STREAM_ITEM_TIMEOUT = 0.05
+
+# Notifications claimed by a dispatcher at once and the time (s) after which
+# the claim of a crashed dispatcher expires and they are sent again.
+NOTIFICATIONS_DISPATCH_CHUNK_SIZE = 500
+NOTIFICATIONS_CLAIM_TIMEOUT = 300
+# The failed deliveries are retried after the exponential backoff (s)
+# until the last attempt, then the notifications are dead-lettered.
+NOTIFICATIONS_MAX_ATTEMPTS = 5
+NOTIFICATIONS_RETRY_BACKOFF = 30
+NOTIFICATIONS_RETRY_BACKOFF_MAX = 3600
+# The dead-lettered notifications are replayed at most this many a second.
+NOTIFICATIONS_REPLAY_RATE = 100
+NOTIFICATIONS_REPLAY_BATCH_SIZE = 100
+# Participants notified by one task of the fan-out to all of them.
+NOTIFICATIONS_FAN_OUT_CHUNK_SIZE = 500
+
+# The notifications to a user within the window (s) are sent as one digest,
+# 0 disables the digests. The immediate types are never coalesced.
+NOTIFICATIONS_DIGEST_WINDOW = int(
+    config.get('NOTIFICATIONS_DIGEST_WINDOW') or '60'
+)
+NOTIFICATIONS_IMMEDIATE_TYPES = (
+    config.get('NOTIFICATIONS_IMMEDIATE_TYPES') or 'booking_confirmation'
+).split(',')
+
+# The notifications table is partitioned by month: the partitions are
+# created for the months ahead and dropped after the retention period.
+NOTIFICATIONS_PARTITIONS_AHEAD = 3
+NOTIFICATIONS_RETENTION_MONTHS = int(
+    config.get('NOTIFICATIONS_RETENTION_MONTHS') or '12'
+)
+
+# Outbox messages published by one relay query.
+OUTBOX_RELAY_BATCH_SIZE = 500
+
+BOOKING_LOCK_TIMEOUT_MS = int(config.get('BOOKING_LOCK_TIMEOUT_MS') or '200')
+BOOKING_LOCK_RETRIES = int(config.get('BOOKING_LOCK_RETRIES') or '3')
+
+# The participants are reminded of the event this long before it starts.
+EVENTS_REMINDER_LEAD = timedelta(hours=1)
+# The reminders due within this time are scheduled as ETA tasks, the later
+# ones by the notify_upcoming_events sweep. The ETA tasks are kept in the
+# memory of the workers (and redelivered every visibility timeout by
+# Valkey), so it is at least the interval of the sweep and much shorter
+# than the visibility timeout.
+EVENTS_REMINDER_HORIZON = timedelta(minutes=10)
+
+# PostgreSQL text search configuration of Event.search_vector, changing it
+# requires a new migration (makemigrations) that rebuilds the column.
+EVENTS_SEARCH_CONFIG = config.get('SEARCH_CONFIG') or 'english'
@@ -0,0 +1,15 @@
+from functools import cache
+
+from django.conf import settings
+from redis import Redis
+
+
+@cache
+def get_client() -> Redis:
+    """
+    Valkey client of the process.
+
+    The connection pool is thread safe and reconnects after a fork,
+    so a single client is shared by all the requests and tasks.
+    """
+    return Redis.from_url(settings.VALKEY_URL)
@@ -1,22 +1,23 @@
-from typing import Any
-
 from django.contrib import admin
-from django.db.models import ForeignKey, QuerySet
-from django.forms import ModelChoiceField
+from django.db import transaction
+from django.db.models import QuerySet
+from django.forms import ModelForm
 from django.http import HttpRequest
 
-from events.models import Booking, Event
+from events import cache
+from events.models import Booking, Event, WaitlistEntry
 from events.services import EventService
 
 
 pk = 'pk'
+user = 'user'
 
 
 @admin.register(Event)
 class EventAdmin(admin.ModelAdmin):
     """Admin interface configuration for the Event model."""
 
-    readonly_fields = ('seats_available',)
+    readonly_fields = ('seats_booked', 'seats_available')
     list_display = (
         pk,
         'status',
@@ -33,20 +34,80 @@ class EventAdmin(admin.ModelAdmin):
     def get_queryset(self, request: HttpRequest) -> QuerySet[Event]:
         return EventService.get_sorted_events()
 
+    def save_model(
+        self,
+        request: HttpRequest,
+        obj: Event,  # noqa: WPS110
+        form: ModelForm,
+        change: bool,  # noqa: FBT001
+    ) -> None:
+        """
+        Schedules the reminder of the created or rescheduled event and
+        drops its cached payload and list pages.
+        """
+        rescheduled = not change or 'start_time' in form.changed_data
+        if rescheduled:
+            obj.reminded_at = None
+        super().save_model(request, obj, form, change)
+        cache.invalidate_events(obj.pk)
+        if rescheduled:
+            EventService.schedule_reminder(obj)
+
+    def delete_model(
+        self,
+        request: HttpRequest,
+        obj: Event,  # noqa: WPS110
+    ) -> None:
+        event_id = obj.pk
+        super().delete_model(request, obj)
+        cache.invalidate_events(event_id)
+
+    def delete_queryset(
+        self, request: HttpRequest, queryset: QuerySet[Event]
+    ) -> None:
+        super().delete_queryset(request, queryset)
+        cache.invalidate_events()
+
 
 @admin.register(Booking)
 class BookingAdmin(admin.ModelAdmin):
     """Admin interface configuration for the Booking model."""
 
-    list_display = (pk, 'event__title', 'user', 'seats')
+    list_display = (pk, 'event__title', user, 'seats')
     list_display_links = list_display
     search_fields = list_display
-    list_filter = ('event', 'user', 'attended')
+    list_filter = ('event', user, 'attended')
     ordering = ('created_at',)
+    # The seats are booked through the API only, where the counters of the
+    # events and their capacity are checked: the admin marks the attendance
+    # and deletes the bookings, taking their seats back.
+    readonly_fields = ('event', user, 'seats')
+
+    def has_add_permission(self, request: HttpRequest) -> bool:
+        return False
+
+    def delete_model(
+        self,
+        request: HttpRequest,
+        obj: Booking,  # noqa: WPS110
+    ) -> None:
+        with transaction.atomic():
+            EventService.release_bookings(Booking.objects.filter(pk=obj.pk))
+            super().delete_model(request, obj)
 
-    def formfield_for_foreignkey(
-        self, db_field: ForeignKey, request: HttpRequest, **kwargs: Any
-    ) -> ModelChoiceField | None:
-        if db_field.name == 'event':
-            kwargs['queryset'] = EventService.get_booking_available_events()
-        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+    def delete_queryset(
+        self, request: HttpRequest, queryset: QuerySet[Booking]
+    ) -> None:
+        with transaction.atomic():
+            EventService.release_bookings(queryset)
+            super().delete_queryset(request, queryset)
+
+
+@admin.register(WaitlistEntry)
+class WaitlistEntryAdmin(admin.ModelAdmin):
+    """Admin interface configuration for the WaitlistEntry model."""
+
+    list_display = (pk, 'event__title', user, 'seats', 'created_at')
+    list_display_links = list_display
+    list_filter = ('event',)
+    ordering = ('created_at',)
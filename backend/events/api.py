@@ -1,20 +1,28 @@
-from typing import Literal, cast
+from typing import Any, Literal, cast
 
+from config.pagination import KeysetPagination
 from django.contrib.auth.models import User
 from django.db.models import QuerySet
 from django.http import HttpRequest
 from ninja import Query, Router
 
-from events.models import Booking, Event
-from events.schemas import (
+from events.models import Booking, Event, WaitlistEntry
+from events.schemas import (  # noqa: WPS235
+    BatchBookingIn,
+    BatchBookingOut,
     BookingOut,
     CreateBookingIn,
     EventFilterSchema,
     EventIn,
     EventOut,
+    EventPageOut,
     EventStatusUpdateIn,
+    EventSuggestionIn,
+    EventSuggestionOut,
+    SeatHoldOut,
+    WaitlistEntryOut,
 )
-from events.services import EventService
+from events.services import EventService, WaitlistService
 
 
 DEFAULT_QUERY = Query(...)
@@ -22,32 +30,69 @@ DEFAULT_QUERY = Query(...)
 router = Router()
 
 
-@router.get('/', response=list[EventOut])
+@router.get('/', response=EventPageOut)
 def list_events(
     request: HttpRequest,
     filters: EventFilterSchema = DEFAULT_QUERY,
-) -> QuerySet[Event]:
+    pagination: KeysetPagination.Input = DEFAULT_QUERY,
+) -> dict[str, Any]:
     """
     A list of all events sorted by:
     - Current (UPCOMING), start_time
     - Outdated (COMPLETED and CANCELLED), -start_time
+
+    The list is paginated with an opaque cursor: pass `next` of the
+    response as `cursor` to get the next page.
+
+    The pages are cached until the events change.
     """
-    return filters.filter(EventService.get_sorted_events())
+    return EventService.get_events_page(filters, pagination)
+
+
+@router.get('/autocomplete/', response=list[EventSuggestionOut])
+def autocomplete_events(
+    request: HttpRequest,
+    suggestion: EventSuggestionIn = DEFAULT_QUERY,
+) -> QuerySet[Event]:
+    """
+    Event suggestions by the title or city, tolerant to typos.
+    """
+    return EventService.get_event_suggestions(
+        query=suggestion.q, limit=suggestion.limit
+    )
 
 
 @router.get('/upcoming/', response=list[EventOut])
 def user_upcoming_events(request: HttpRequest) -> QuerySet[Event]:
     return EventService.get_user_upcoming_events(
-        visitor=cast(User, request.user)
+        visitor=cast(User, request.auth)  # type: ignore
+    )
+
+
+@router.post('/book/batch/', response=BatchBookingOut)
+def book_events(
+    request: HttpRequest, booking_data: BatchBookingIn
+) -> BatchBookingOut:
+    """
+    Book several events at once.
+
+    With `atomic` (default) either all the events are booked or none,
+    otherwise the available events are booked and the others are
+    reported in `errors`.
+    """
+    return EventService.create_bookings(
+        visitor=cast(User, request.auth),  # type: ignore
+        booking_items=booking_data.items,
+        atomic=booking_data.atomic,
     )
 
 
 @router.get('/{event_id}/', response=EventOut)
-def get_event(request: HttpRequest, event_id: int) -> Event:
+def get_event(request: HttpRequest, event_id: int) -> dict[str, Any]:
     """
     Get detailed information about the event by ID.
     """
-    return EventService.get_event_by_id(event_id)
+    return EventService.get_event_data(event_id)
 
 
 @router.post('/', response=EventOut)
@@ -59,7 +104,7 @@ def create_event(request: HttpRequest, event_data: EventIn) -> Event:
     """
     return EventService.create_event(
         event_data=event_data,
-        organizer=cast(User, request.user),
+        organizer=cast(User, request.auth),  # type: ignore
     )
 
 
@@ -75,7 +120,7 @@ def update_event_status(
     return EventService.update_event_status(
         event_id=event_id,
         status=status_data.status,
-        organizer=cast(User, request.user),
+        organizer=cast(User, request.auth),  # type: ignore
     )
 
 
@@ -90,7 +135,7 @@ def delete_event(
     """
     EventService.delete_event(
         event_id=event_id,
-        organizer=cast(User, request.user),
+        organizer=cast(User, request.auth),  # type: ignore
     )
     return 204, None
 
@@ -107,7 +152,7 @@ def book_event(
     There is only one reservation available for one event.
     """
     return EventService.create_booking(
-        visitor=cast(User, request.user),
+        visitor=cast(User, request.auth),  # type: ignore
         event_id=event_id,
         seats=booking_data.seats,
     )
@@ -119,7 +164,79 @@ def cancel_booking(request: HttpRequest, event_id: int) -> tuple[int, None]:
     Cancel reservation.
     """
     EventService.cancel_booking(
-        visitor=cast(User, request.user),
+        visitor=cast(User, request.auth),  # type: ignore
+        event_id=event_id,
+    )
+    return 204, None
+
+
+@router.post('/{event_id}/hold/', response=SeatHoldOut)
+def hold_seats(
+    request: HttpRequest,
+    event_id: int,
+    booking_data: CreateBookingIn,
+) -> SeatHoldOut:
+    """
+    Hold seats of an event for a few minutes before booking them.
+
+    A repeated hold replaces the previous one.
+    """
+    return EventService.hold_seats(
+        visitor=cast(User, request.auth),  # type: ignore
+        event_id=event_id,
+        seats=booking_data.seats,
+    )
+
+
+@router.post('/{event_id}/hold/confirm/', response=BookingOut)
+def confirm_hold(request: HttpRequest, event_id: int) -> Booking:
+    """
+    Book the held seats.
+    """
+    return EventService.confirm_hold(
+        visitor=cast(User, request.auth),  # type: ignore
+        event_id=event_id,
+    )
+
+
+@router.delete('/{event_id}/hold/', response={204: None})
+def release_hold(request: HttpRequest, event_id: int) -> tuple[int, None]:
+    """
+    Release the held seats.
+    """
+    EventService.release_hold(
+        visitor=cast(User, request.auth),  # type: ignore
+        event_id=event_id,
+    )
+    return 204, None
+
+
+@router.post('/{event_id}/waitlist/', response=WaitlistEntryOut)
+def join_waitlist(
+    request: HttpRequest,
+    event_id: int,
+    booking_data: CreateBookingIn,
+) -> WaitlistEntry:
+    """
+    Join the waitlist of a fully booked event.
+
+    The seats are booked automatically as soon as they are freed,
+    in the order of joining. The booking confirmation is sent then.
+    """
+    return WaitlistService.join_waitlist(
+        visitor=cast(User, request.auth),  # type: ignore
+        event_id=event_id,
+        seats=booking_data.seats,
+    )
+
+
+@router.delete('/{event_id}/waitlist/', response={204: None})
+def leave_waitlist(request: HttpRequest, event_id: int) -> tuple[int, None]:
+    """
+    Leave the waitlist.
+    """
+    WaitlistService.leave_waitlist(
+        visitor=cast(User, request.auth),  # type: ignore
         event_id=event_id,
     )
     return 204, None
@@ -1,7 +1,19 @@
 from django.apps import AppConfig
+from django.db.models.signals import pre_delete
 
 
 class EventsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'events'
     verbose_name = 'Events'
+
+    def ready(self) -> None:
+        from django.contrib.auth.models import User  # noqa: PLC0415, WPS433
+
+        from events import signals  # noqa: PLC0415, WPS433
+
+        pre_delete.connect(
+            signals.release_user_bookings,
+            sender=User,
+            dispatch_uid='events.bookings',
+        )
@@ -0,0 +1,153 @@
+import hashlib
+import json
+import logging
+import time
+from collections.abc import Callable
+from functools import partial
+from typing import Any
+
+from config.metrics import Counter
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+
+logger = logging.getLogger(__name__)
+
+CACHE_PREFIX = 'events'
+GENERATION_KEY = f'{CACHE_PREFIX}:version:all'
+LIST_VERSION_KEY = f'{CACHE_PREFIX}:version:list'
+EVENT_VERSION_KEY = 'events:version:event:{event_id}'
+LOCK_TIMEOUT = 10
+LOCK_POLL_INTERVAL = 0.05
+LOCK_POLL_ATTEMPTS = 10
+
+Payload = dict[str, Any]
+
+cache_hits = Counter(
+    'events.cache.hits',
+    'Event reads served from the cache.',
+)
+cache_misses = Counter(
+    'events.cache.misses',
+    'Event reads computed from the database.',
+)
+cache_stampede_waits = Counter(
+    'events.cache.stampede_waits',
+    'Cache misses that waited for another process to compute the entry.',
+)
+
+
+def event_cache_key(event_id: int) -> str:
+    generation, version = _get_versions([
+        GENERATION_KEY,
+        EVENT_VERSION_KEY.format(event_id=event_id),
+    ])
+    return f'{CACHE_PREFIX}:event:{event_id}:{generation}:{version}'
+
+
+def events_page_cache_key(query: dict[str, Any]) -> str:
+    """Key of the list page requested with the filter and pagination query."""
+    digest = hashlib.sha256(
+        json.dumps(query, sort_keys=True, default=str).encode()
+    ).hexdigest()
+    version = _get_versions([LIST_VERSION_KEY])[0]
+    return f'{CACHE_PREFIX}:page:{version}:{digest}'
+
+
+def read_through(
+    build_key: Callable[[], str], compute: Callable[[], Payload]
+) -> Payload:
+    """
+    Returns the cached payload or computes and caches it.
+
+    The key embeds the versions of the cached data, so the invalidation
+    only bumps the versions and the stale entries expire by timeout.
+    An unavailable cache falls back to the computation.
+    """
+    try:
+        key = build_key()
+    except Exception:
+        logger.warning('The events cache is unavailable', exc_info=True)
+        return compute()
+    payload = _call_cache(cache.get, key)
+    if payload is not None:
+        cache_hits.inc()
+        return payload
+    cache_misses.inc()
+    return _compute_once(key, compute)
+
+
+def invalidate_events(event_id: int | None = None) -> None:
+    """
+    Drops the cached list pages and the event (all the events by default)
+    when the changes commit.
+    """
+    version_key = (
+        GENERATION_KEY
+        if event_id is None
+        else EVENT_VERSION_KEY.format(event_id=event_id)
+    )
+    transaction.on_commit(
+        partial(_bump_versions, version_key, LIST_VERSION_KEY)
+    )
+
+
+def _get_versions(keys: list[str]) -> list[int]:
+    """
+    Current versions of the keys.
+
+    A missing (new or evicted) version starts from the current time,
+    so it never returns to a value that stale entries were cached with.
+    """
+    versions = cache.get_many(keys)
+    for key in set(keys) - versions.keys():
+        cache.add(key, time.time_ns(), timeout=None)
+        versions[key] = cache.get(key)
+    return [versions[version_key] for version_key in keys]
+
+
+def _bump_versions(*keys: str) -> None:
+    for key in keys:
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns(), timeout=None)
+        except Exception:
+            logger.warning('Unable to invalidate %s', key, exc_info=True)
+
+
+def _compute_once(key: str, compute: Callable[[], Payload]) -> Payload:
+    """
+    Stampede protection: only the process holding the lock computes
+    the missing entry, the others wait for it to appear in the cache.
+    """
+    lock_key = f'{key}:lock'
+    locked = _call_cache(cache.add, lock_key, 1, timeout=LOCK_TIMEOUT)
+    if locked is None:
+        return compute()
+    if not locked:
+        cache_stampede_waits.inc()
+        for _ in range(LOCK_POLL_ATTEMPTS):
+            time.sleep(LOCK_POLL_INTERVAL)
+            payload = _call_cache(cache.get, key)
+            if payload is not None:
+                return payload
+        return compute()
+    try:
+        payload = compute()
+    except Exception:
+        _call_cache(cache.delete, lock_key)
+        raise
+    _call_cache(cache.set, key, payload, timeout=settings.EVENTS_CACHE_TIMEOUT)
+    _call_cache(cache.delete, lock_key)
+    return payload
+
+
+def _call_cache(method: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """The result of the cache call or None if the cache is unavailable."""
+    try:
+        return method(*args, **kwargs)
+    except Exception:
+        logger.warning('The events cache is unavailable', exc_info=True)
+        return None
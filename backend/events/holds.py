@@ -0,0 +1,116 @@
+import logging
+from functools import cache
+from pathlib import Path
+
+from config.valkey import get_client
+from django.conf import settings
+from ninja.errors import HttpError
+from redis import RedisError
+from redis.commands.core import Script
+
+
+logger = logging.getLogger(__name__)
+
+# The holds of an event are kept in three keys sharing the {event_id} hash
+# tag (a single slot in a cluster), so the scripts update them atomically:
+# - holds: ZSET of the holders scored by the hold expiry time (ms),
+# - hold_seats: HASH of the seats held by every holder,
+# - held: the number of seats held by all the holders.
+HOLD_KEYS = (
+    'events:{{{event_id}}}:holds',
+    'events:{{{event_id}}}:hold_seats',
+    'events:{{{event_id}}}:held',
+)
+
+LUA_DIR = Path(__file__).resolve().parent / 'lua'
+# The holds live in Valkey only, they are not placed, confirmed or
+# released without it.
+UNAVAILABLE_STATUS = 503
+UNAVAILABLE_DETAIL = 'The seat holds are temporarily unavailable'
+
+
+def place_hold(
+    event_id: int, holder_id: int, seats: int, available: int
+) -> int | None:
+    """
+    Holds the seats of the event for `EVENTS_HOLD_TTL` seconds.
+
+    A repeated hold replaces the previous one of the holder. Returns
+    the seats left for the others or None if there are not enough seats.
+    """
+    try:
+        seats_left = _script('place_hold')(
+            keys=_keys(event_id),
+            args=[holder_id, seats, available, settings.EVENTS_HOLD_TTL * 1000],
+        )
+    except RedisError as error:
+        logger.warning('Unable to place the hold', exc_info=True)
+        raise HttpError(UNAVAILABLE_STATUS, UNAVAILABLE_DETAIL) from error
+    return None if seats_left < 0 else seats_left
+
+
+def get_hold(event_id: int, holder_id: int) -> tuple[int, int]:
+    """
+    The seats held by the active hold of the holder and the seats held
+    by the others.
+    """
+    get_hold_script = _script('get_hold')
+    try:
+        own, others = get_hold_script(keys=_keys(event_id), args=[holder_id])
+    except RedisError as error:
+        logger.warning('Unable to get the hold', exc_info=True)
+        raise HttpError(UNAVAILABLE_STATUS, UNAVAILABLE_DETAIL) from error
+    return own, others
+
+
+def take_hold(event_id: int, holder_id: int) -> int:
+    """Removes the active hold, returns its seats (0 if it has expired)."""
+    try:
+        return _script('take_hold')(keys=_keys(event_id), args=[holder_id])
+    except RedisError as error:
+        logger.warning('Unable to take the hold', exc_info=True)
+        raise HttpError(UNAVAILABLE_STATUS, UNAVAILABLE_DETAIL) from error
+
+
+def get_held_seats(event_id: int) -> int:
+    """
+    Seats of the event held by the active holds.
+
+    An unavailable Valkey doesn't break the booking: no seats are
+    considered held then.
+    """
+    try:
+        return _script('get_held_seats')(keys=_keys(event_id))
+    except RedisError:
+        logger.warning('Unable to get the held seats', exc_info=True)
+        return 0
+
+
+def get_held_seats_many(event_ids: list[int]) -> dict[int, int]:
+    """Held seats of several events fetched in one round trip."""
+    script = _script('get_held_seats')
+    try:
+        with get_client().pipeline(transaction=False) as pipeline:
+            for event_id in event_ids:
+                script(keys=_keys(event_id), client=pipeline)
+            held_seats = pipeline.execute()
+    except RedisError:
+        logger.warning('Unable to get the held seats', exc_info=True)
+        return dict.fromkeys(event_ids, 0)
+    return dict(zip(event_ids, held_seats, strict=True))
+
+
+def _keys(event_id: int) -> list[str]:
+    return [key.format(event_id=event_id) for key in HOLD_KEYS]
+
+
+@cache
+def _script(name: str) -> Script:
+    """
+    Registered Lua script prefixed with the expired holds purge.
+
+    It runs with EVALSHA and loads itself into Valkey when missing.
+    """
+    source = (LUA_DIR / 'purge_expired.lua').read_text()
+    source += (LUA_DIR / f'{name}.lua').read_text()
+    return get_client().register_script(source)
@@ -0,0 +1,2 @@
+-- Returns the seats held by the active holds.
+return held
@@ -0,0 +1,3 @@
+-- ARGV: holder. Returns the seats held by the holder and by the others.
+local own = tonumber(redis.call('HGET', KEYS[2], ARGV[1]) or '0')
+return {own, held - own}
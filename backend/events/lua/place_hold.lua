@@ -0,0 +1,19 @@
+-- ARGV: holder, seats, available seats of the event, TTL (ms).
+-- Returns the seats left after the hold or -1 if there are not enough.
+local holder, seats = ARGV[1], tonumber(ARGV[2])
+local available, ttl = tonumber(ARGV[3]), tonumber(ARGV[4])
+if not seats or seats <= 0 then
+    return redis.error_reply('ERR the held seats must be positive')
+end
+local own = tonumber(redis.call('HGET', KEYS[2], holder) or '0')
+if held - own + seats > available then
+    return -1
+end
+drop(holder)
+redis.call('ZADD', KEYS[1], now + ttl, holder)
+redis.call('HSET', KEYS[2], holder, seats)
+redis.call('INCRBY', KEYS[3], seats)
+for _, key in ipairs(KEYS) do
+    redis.call('PEXPIRE', key, ttl)
+end
+return available - (held - own + seats)
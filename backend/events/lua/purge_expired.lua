@@ -0,0 +1,20 @@
+-- Drops the expired holds, the shared prelude of all the scripts.
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+
+local function drop(holder)
+    local seats = redis.call('HGET', KEYS[2], holder)
+    if not seats then
+        return 0
+    end
+    redis.call('HDEL', KEYS[2], holder)
+    redis.call('ZREM', KEYS[1], holder)
+    redis.call('DECRBY', KEYS[3], seats)
+    return tonumber(seats)
+end
+
+for _, holder in ipairs(redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', now)) do
+    drop(holder)
+end
+
+local held = math.max(tonumber(redis.call('GET', KEYS[3]) or '0'), 0)
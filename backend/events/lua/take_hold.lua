@@ -0,0 +1,2 @@
+-- ARGV: holder. Returns the seats of the removed hold (0 if there is none).
+return drop(ARGV[1])
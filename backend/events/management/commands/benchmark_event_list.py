@@ -0,0 +1,148 @@
+import re
+import statistics
+import time
+from datetime import timedelta
+from typing import Any
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection, transaction
+from django.db.models import F, QuerySet, Sum, Value  # noqa: WPS347
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from events.models import Booking, Event
+from events.services import EventService
+
+
+BENCHMARK_PREFIX = 'benchmark'
+BATCH_SIZE = 5000
+# The cases of the stored timeline ordering, served by the index scan.
+STORED_SUFFIX = '(stored)'
+# A Sort or Incremental Sort node of a text plan.
+SORT_NODE = re.compile(r'\bSort\b')
+
+
+def create_benchmark_data(events_count: int, bookings_count: int) -> None:
+    """Creates events where every benchmark user books every event once."""
+    users_count = max(bookings_count // events_count, 1)
+    organizer = User.objects.create(
+        username=f'{BENCHMARK_PREFIX}_organizer',
+        password=make_password(None),
+        is_staff=True,
+    )
+    users = User.objects.bulk_create(
+        (
+            User(
+                username=f'{BENCHMARK_PREFIX}_visitor_{index}',
+                password=make_password(None),
+            )
+            for index in range(users_count)
+        ),
+        batch_size=BATCH_SIZE,
+    )
+    now = timezone.now()
+    events = Event.objects.bulk_create(
+        (
+            Event(
+                title=f'{BENCHMARK_PREFIX} event {index}',
+                start_time=now + timedelta(hours=index - events_count // 2),
+                city='Moscow',
+                seats_total=users_count + index % 2,
+                organizer=organizer,
+            )
+            for index in range(events_count)
+        ),
+        batch_size=BATCH_SIZE,
+    )
+    Booking.objects.bulk_create(
+        (Booking(event=event, user=user) for event in events for user in users),
+        batch_size=BATCH_SIZE,
+    )
+    EventService.reconcile_seats_booked()
+
+
+def get_aggregated_events() -> QuerySet[Event]:
+    """The event list as it was computed before the stored counter."""
+    seats_booked = Coalesce(Sum('bookings__seats'), Value(0))
+    return EventService.get_sorted_events().annotate(
+        aggregated_seats_booked=seats_booked,
+        aggregated_seats_available=F('seats_total') - seats_booked,
+    )
+
+
+def measure(queryset: QuerySet[Event], repeat: int) -> float:
+    """Returns the median time of the queryset evaluation in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        list(queryset.all())
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+class Command(BaseCommand):
+    """Compares the event list latency with aggregated and stored counters."""
+
+    help = (
+        'Measures the event list latency before and after the stored '
+        'seats counter and timeline ordering. All the created data is '
+        'rolled back.'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--events', type=int, default=1000)
+        parser.add_argument('--bookings', type=int, default=100_000)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument(
+            '--explain',
+            action='store_true',
+            help=(
+                'Print the query plans of the first page of every case and '
+                'fail if a stored ordering plan sorts the events.'
+            ),
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:  # noqa: WPS110
+        """Creates the benchmark data, measures and rolls it back."""
+        repeat = options['repeat']
+        with transaction.atomic():
+            create_benchmark_data(options['events'], options['bookings'])
+            cases = {
+                'list (aggregate)': get_aggregated_events(),
+                'list (stored)': EventService.get_sorted_events(),
+                'available (aggregate)': get_aggregated_events().filter(
+                    aggregated_seats_available__gte=1  # type: ignore
+                ),
+                'available (stored)': EventService.get_sorted_events().filter(
+                    seats_available__gte=1
+                ),
+            }
+            for name, queryset in cases.items():
+                self.stdout.write(
+                    f'{name:<24} {measure(queryset, repeat):>10.2f} ms'
+                )
+            sorted_cases = self.explain(cases) if options['explain'] else []
+            transaction.set_rollback(True)
+        if sorted_cases:
+            raise CommandError(
+                'The stored ordering is sorted instead of index-scanned: '
+                + ', '.join(sorted_cases)
+            )
+
+    def explain(self, cases: dict[str, QuerySet[Event]]) -> list[str]:
+        """
+        Prints the plans of the first pages, the stored timeline ordering
+        is expected to be served by an index scan without a Sort node.
+        Returns the names of the stored cases whose plan has one.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE events_event, events_booking')
+        sorted_cases = []
+        for name, queryset in cases.items():
+            plan = queryset[: settings.NINJA_PAGINATION_PER_PAGE].explain()
+            self.stdout.write(f'--- {name}\n{plan}')
+            if name.endswith(STORED_SUFFIX) and SORT_NODE.search(plan):
+                sorted_cases.append(name)
+        return sorted_cases
@@ -0,0 +1,31 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from events.services import EventService
+
+
+class Command(BaseCommand):
+    """Reconciles the stored seat counters with the bookings table."""
+
+    help = 'Fixes Event.seats_booked counters that drifted from bookings.'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report the drifted events without fixing them.',
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:  # noqa: WPS110
+        """Reports (and fixes) the events with a drifted counter."""
+        dry_run = options['dry_run']
+        drifted_ids = EventService.reconcile_seats_booked(dry_run=dry_run)
+        if not drifted_ids:
+            self.stdout.write(self.style.SUCCESS('No drift found.'))
+            return
+        action = 'Drifted' if dry_run else 'Reconciled'
+        self.stdout.write(
+            self.style.WARNING(
+                f'{action} {len(drifted_ids)} events: {drifted_ids}'
+            )
+        )
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.1 on 2026-10-17 23:50
+
+import django.db.models.expressions
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0003_alter_event_options'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='seats_booked',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunSQL(
+            sql=(
+                'UPDATE events_event SET seats_booked = COALESCE(('
+                'SELECT SUM(events_booking.seats) FROM events_booking '
+                'WHERE events_booking.event_id = events_event.id), 0)'
+            ),
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='seats_available',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(models.F('seats_total'), '-', models.F('seats_booked')), output_field=models.IntegerField()),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['status', 'seats_available'], name='events_even_status_20fed7_idx'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.1 on 2026-10-17 23:55
+
+import django.db.models.expressions
+import events.models
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0004_event_seats_booked_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='timeline_position',
+            field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(status='upcoming', then=events.models.Epoch('start_time')), default=django.db.models.expressions.CombinedExpression(models.Value(10000000000), '-', events.models.Epoch('start_time'))), output_field=models.BigIntegerField()),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['timeline_position', 'id'], name='events_even_timelin_236d8e_idx'),
+        ),
+    ]
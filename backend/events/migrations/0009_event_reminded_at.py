@@ -0,0 +1,32 @@
+# Generated by Django 5.2.1 on 2026-10-18 00:32
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0008_waitlistentry'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='reminded_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        # The past events need no reminder, they are kept out of the index.
+        migrations.RunSQL(
+            sql=(
+                'UPDATE events_event SET reminded_at = start_time '
+                'WHERE start_time <= NOW()'
+            ),
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('reminded_at__isnull', True)), fields=['start_time'], name='events_event_unreminded_idx'),
+        ),
+    ]
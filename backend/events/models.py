@@ -1,21 +1,19 @@
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import (
+    SearchVector,
+    SearchVectorField,
+    TrigramWordSimilarity,
+)
 from django.db import models
-from django.db.models.functions import Coalesce
+from django.db.models.functions import Cast, Greatest, Upper
 
 
-class EventManager(models.Manager):
-    def get_queryset(self) -> models.QuerySet:
-        return (
-            super()
-            .get_queryset()
-            .annotate(
-                _seats_booked=Coalesce(
-                    models.Sum('bookings__seats'), models.Value(0)
-                ),
-                _seats_available=models.F('seats_total')
-                - Coalesce(models.Sum('bookings__seats'), models.Value(0)),
-            )
-        )
+# Later than any real event start (2286-11-20), puts past events after
+# the upcoming ones on the timeline.
+PAST_EVENTS_OFFSET = 10**10
+START_TIME = 'start_time'
 
 
 class EventStatus(models.TextChoices):
@@ -24,8 +22,55 @@ class EventStatus(models.TextChoices):
     COMPLETED = 'completed', 'Завершено'
 
 
+class Epoch(models.Func):
+    """
+    Seconds since the Unix epoch.
+
+    Converted to UTC first, so the expression is immutable and can be
+    stored in a generated column.
+    """
+
+    template = (
+        "CAST(EXTRACT(EPOCH FROM (%(expressions)s AT TIME ZONE 'UTC')) "
+        'AS bigint)'
+    )
+    output_field = models.BigIntegerField()
+
+
+class EventQuerySet(models.QuerySet):
+    def similar_to(self, query: str) -> 'EventQuerySet':
+        """
+        Typo-tolerant search over the title and city.
+
+        Uses the pg_trgm word similarity operator, served by the trigram
+        indexes, and ranks the events by the best similarity.
+        """
+        return (
+            self.alias(
+                upper_title=Upper('title'),
+                upper_city=Upper('city'),
+            )
+            .filter(
+                models.Q(upper_title__trigram_word_similar=query)
+                | models.Q(upper_city__trigram_word_similar=query)
+            )
+            .annotate(
+                # double precision keeps the similarity exact in the
+                # keyset pagination cursor (pg_trgm returns real)
+                similarity=Cast(
+                    Greatest(
+                        TrigramWordSimilarity(query, 'upper_title'),
+                        TrigramWordSimilarity(query, 'upper_city'),
+                    ),
+                    models.FloatField(),
+                ),
+            )
+            .order_by('-similarity')
+        )
+
+
 class Event(models.Model):
-    objects = EventManager()  # noqa: WPS110
+    objects = EventQuerySet.as_manager()  # noqa: WPS110
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     title = models.CharField(max_length=255)
@@ -33,6 +78,12 @@ class Event(models.Model):
     start_time = models.DateTimeField()
     city = models.CharField(max_length=100)
     seats_total = models.PositiveIntegerField()
+    seats_booked = models.PositiveIntegerField(default=0, editable=False)
+    seats_available = models.GeneratedField(
+        expression=models.F('seats_total') - models.F('seats_booked'),
+        output_field=models.IntegerField(),
+        db_persist=True,
+    )
     status = models.CharField(
         max_length=20,
         choices=EventStatus.choices,
@@ -44,14 +95,32 @@ class Event(models.Model):
         related_name='organized_events',
         limit_choices_to={'is_staff': True},
     )
-
-    @property
-    def seats_available(self) -> int:
-        return getattr(self, '_seats_available', 0)
-
-    @property
-    def seats_booked(self) -> int:
-        return getattr(self, '_seats_booked', 0)
+    # Set when the reminder is sent, reset when the event is rescheduled.
+    reminded_at = models.DateTimeField(null=True, blank=True, editable=False)
+    # Upcoming events by start_time, then past events by -start_time.
+    timeline_position = models.GeneratedField(
+        expression=models.Case(
+            models.When(status=EventStatus.UPCOMING, then=Epoch(START_TIME)),
+            default=models.Value(PAST_EVENTS_OFFSET) - Epoch(START_TIME),
+        ),
+        output_field=models.BigIntegerField(),
+        db_persist=True,
+    )
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector(
+                'title', weight='A', config=settings.EVENTS_SEARCH_CONFIG
+            )
+            + SearchVector(
+                'description', weight='B', config=settings.EVENTS_SEARCH_CONFIG
+            )
+            + SearchVector(
+                'city', weight='C', config=settings.EVENTS_SEARCH_CONFIG
+            )
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
 
     def __str__(self) -> str:
         return '{title} {start_time}'.format(
@@ -62,8 +131,26 @@ class Event(models.Model):
     class Meta:
         indexes = (
             models.Index(fields=['start_time']),
-            models.Index(fields=['city']),
             models.Index(fields=['status']),
+            models.Index(fields=['status', 'seats_available']),
+            models.Index(fields=['timeline_position', 'id']),
+            # The events waiting for the reminder.
+            models.Index(
+                fields=[START_TIME],
+                condition=models.Q(reminded_at__isnull=True),
+                name='events_event_unreminded_idx',
+            ),
+            GinIndex(fields=['search_vector']),
+            # Trigram indexes on UPPER() also serve Django's icontains
+            # (UPPER(column) LIKE UPPER(...)) and the fuzzy search.
+            GinIndex(
+                OpClass(Upper('title'), name='gin_trgm_ops'),
+                name='events_event_title_trgm',
+            ),
+            GinIndex(
+                OpClass(Upper('city'), name='gin_trgm_ops'),
+                name='events_event_city_trgm',
+            ),
         )
 
 
@@ -88,3 +175,49 @@ class Booking(models.Model):
             event=self.event.title,
             seats=self.seats,
         )
+
+
+class WaitlistEntryQuerySet(models.QuerySet):
+    def with_position(self) -> 'WaitlistEntryQuerySet':
+        """
+        Annotates the 1-based place of every entry in the waitlist of its
+        event, counted in the same query over the (event, id) index.
+        """
+        ahead = (
+            WaitlistEntry.objects.filter(
+                event_id=models.OuterRef('event_id'),
+                pk__lte=models.OuterRef('pk'),
+            )
+            .order_by()
+            .values('event_id')
+            .annotate(count=models.Count('pk'))
+            .values('count')
+        )
+        return self.annotate(position=models.Subquery(ahead))
+
+
+class WaitlistEntry(models.Model):
+    """A visitor waiting for the seats of a fully booked event."""
+
+    objects = WaitlistEntryQuerySet.as_manager()  # noqa: WPS110
+    created_at = models.DateTimeField(auto_now_add=True)
+    event = models.ForeignKey(
+        Event, on_delete=models.CASCADE, related_name='waitlist'
+    )
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name='waitlist_entries'
+    )
+    seats = models.PositiveSmallIntegerField(default=1)
+
+    class Meta:
+        unique_together = ('event', 'user')
+        # FIFO order of the waitlist of an event
+        indexes = (models.Index(fields=['event', 'id']),)
+        verbose_name_plural = 'waitlist entries'
+
+    def __str__(self) -> str:
+        return '{user} ({seats}) - {event}'.format(
+            user=self.user.username,
+            event=self.event.title,
+            seats=self.seats,
+        )
@@ -1,12 +1,17 @@
 from datetime import date, datetime
 from typing import Annotated
 
-from django.contrib.postgres.search import SearchRank, SearchVector
-from django.db.models import QuerySet
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F, FloatField, QuerySet  # noqa: WPS347
+from django.db.models.functions import Cast
 from ninja import FilterSchema, ModelSchema, Schema
 from pydantic import AfterValidator, Field
 
-from events.models import Booking, Event, EventStatus
+from events.models import Booking, Event, EventStatus, WaitlistEntry
+
+
+MAX_BATCH_BOOKINGS = 20
 
 
 class EventFilterSchema(FilterSchema):
@@ -31,33 +36,59 @@ class EventFilterSchema(FilterSchema):
     )
     description: str | None = Field(
         default=None,
+        description='Full-text search over the title, description and city.',
+    )
+    q: str | None = Field(  # type: ignore  # noqa: WPS111
+        default=None,
+        description='Typo-tolerant search over the title and city.',
+        example='Mscow',
     )
 
     def filter(self, queryset: QuerySet) -> QuerySet:  # type: ignore
-        if self.available_for_booking is not None:
-            available_for_booking_check = self.available_for_booking
-            self.available_for_booking = None  # noqa: WPS601
-            if available_for_booking_check:
-                queryset = queryset.filter(_seats_available__gte=1)
-            else:
-                queryset = queryset.filter(_seats_available=0)
-        if self.description is not None:
-            description_query = self.description
-            self.description = None  # noqa: WPS601
-            if description_query:
-                queryset = (
-                    queryset.annotate(
-                        search=SearchVector('description'),
-                        rank=SearchRank(
-                            vector=SearchVector('description'),
-                            query=description_query,
-                        ),
-                    )
-                    .filter(search=description_query)
-                    .order_by('-rank')
-                )
+        queryset = self._filter_available_for_booking(queryset)
+        queryset = self._search_similar(queryset)
+        queryset = self._search_description(queryset)
         return super().filter(queryset)
 
+    def _filter_available_for_booking(self, queryset: QuerySet) -> QuerySet:
+        if self.available_for_booking is None:
+            return queryset
+        available_for_booking_check = self.available_for_booking
+        self.available_for_booking = None  # noqa: WPS601
+        if available_for_booking_check:
+            return queryset.filter(seats_available__gte=1)
+        return queryset.filter(seats_available=0)
+
+    def _search_similar(self, queryset: QuerySet) -> QuerySet:
+        similar_query = self.q
+        self.q = None  # noqa: WPS111,WPS601
+        if not similar_query:
+            return queryset
+        return queryset.similar_to(similar_query)  # type: ignore
+
+    def _search_description(self, queryset: QuerySet) -> QuerySet:
+        description_query = self.description
+        self.description = None  # noqa: WPS601
+        if not description_query:
+            return queryset
+        search_query = SearchQuery(
+            description_query,
+            config=settings.EVENTS_SEARCH_CONFIG,
+            search_type='websearch',
+        )
+        return (
+            queryset.filter(search_vector=search_query)
+            .annotate(
+                # double precision keeps the rank exact in the
+                # keyset pagination cursor (ts_rank returns real)
+                rank=Cast(
+                    SearchRank(F('search_vector'), search_query),
+                    FloatField(),
+                ),
+            )
+            .order_by('-rank')
+        )
+
 
 class EventIn(Schema):
     title: str
@@ -68,9 +99,6 @@ class EventIn(Schema):
 
 
 class EventOut(ModelSchema):
-    seats_booked: int = 0
-    seats_available: int = 0
-
     class Meta:
         model = Event
         fields = (
@@ -80,23 +108,78 @@ class EventOut(ModelSchema):
             'start_time',
             'city',
             'seats_total',
+            'seats_booked',
+            'seats_available',
             'status',
             'organizer',
         )
 
 
+class EventPageOut(Schema):
+    items: list[EventOut]  # noqa: WPS110
+    next: str | None = None
+    estimated_total: int | None = None
+
+
 def validate_status(status: str) -> str:
     if status not in EventStatus:
         raise ValueError(f'The status should be one of: {EventStatus.values}')
     return status
 
 
+class EventSuggestionIn(Schema):
+    q: str = Field(min_length=3, examples=['Mscow'])  # noqa: WPS111
+    limit: int = Field(default=10, ge=1, le=20)
+
+
+class EventSuggestionOut(ModelSchema):
+    class Meta:
+        model = Event
+        fields = ('id', 'title', 'city', 'start_time')
+
+
 class EventStatusUpdateIn(Schema):
     status: Annotated[str, AfterValidator(validate_status)]
 
 
 class CreateBookingIn(Schema):
-    seats: int = 1
+    seats: int = Field(default=1, ge=1)
+
+
+class BookingItemIn(Schema):
+    event_id: int
+    seats: int = Field(default=1, ge=1)
+
+
+def validate_unique_events(
+    booking_items: list[BookingItemIn],
+) -> list[BookingItemIn]:
+    event_ids = {booking_item.event_id for booking_item in booking_items}
+    if len(event_ids) != len(booking_items):
+        raise ValueError('Every event can be booked only once')
+    return booking_items
+
+
+class BatchBookingIn(Schema):
+    items: Annotated[  # noqa: WPS110
+        list[BookingItemIn],
+        Field(min_length=1, max_length=MAX_BATCH_BOOKINGS),
+        AfterValidator(validate_unique_events),
+    ]
+    atomic: bool = Field(
+        default=True,
+        description=(
+            'Book all the events or none of them, '
+            'otherwise book the events that are available.'
+        ),
+    )
+
+
+class SeatHoldOut(Schema):
+    event_id: int
+    seats: int
+    seats_left: int
+    expires_at: datetime
 
 
 class BookingOut(ModelSchema):
@@ -109,3 +192,21 @@ class BookingOut(ModelSchema):
             'seats',
             'attended',
         )
+
+
+class BookingErrorOut(Schema):
+    event_id: int
+    detail: str
+
+
+class BatchBookingOut(Schema):
+    bookings: list[BookingOut]
+    errors: list[BookingErrorOut]
+
+
+class WaitlistEntryOut(ModelSchema):
+    position: int
+
+    class Meta:
+        model = WaitlistEntry
+        exclude = ('user',)
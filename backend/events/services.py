@@ -1,28 +1,85 @@
+import random
+import time
 from datetime import timedelta
 
+from config.metrics import Counter, Histogram
+from config.pagination import KeysetPagination
+from django.conf import settings
 from django.contrib.auth.models import User
-from django.db.models import (  # noqa: WPS347
+from django.db import IntegrityError, OperationalError, connection, transaction
+from django.db.models import (  # noqa: WPS235,WPS347
     Case,
-    ExpressionWrapper,
+    Exists,
     F,
-    Func,
-    IntegerField,
+    OuterRef,
     QuerySet,
+    Subquery,
+    Sum,
     Value,
     When,
 )
+from django.db.models.functions import Coalesce
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from ninja.errors import AuthorizationError, HttpError
-from notifications.tasks import send_booking_confirmation, send_event_cancelled
+from notifications import outbox, tasks
 
-from events.models import Booking, Event, EventStatus
-from events.schemas import EventIn
+from events import cache, holds
+from events.models import Booking, Event, EventStatus, WaitlistEntry
+from events.schemas import (
+    BatchBookingOut,
+    BookingErrorOut,
+    BookingItemIn,
+    EventFilterSchema,
+    EventIn,
+    EventOut,
+    EventPageOut,
+    SeatHoldOut,
+)
+
+
+LOCK_NOT_AVAILABLE = '55P03'
+LOCK_RETRY_JITTER = 0.05
+PK = 'pk'
 
+booking_lock_wait = Histogram(
+    'events.booking.lock_wait_ms',
+    'Time spent waiting for the event row lock while booking.',
+)
+booking_lock_retries = Counter(
+    'events.booking.lock_retries',
+    'Bookings retried after the event row lock timeout.',
+)
+booking_conflicts = Counter(
+    'events.booking.conflicts',
+    'Bookings rejected with 409 Conflict.',
+)
 
-class AbsEpoch(Func):
-    function = 'ABS'
-    template = 'ABS(EXTRACT(EPOCH FROM %(expressions)s)) / 60'
+
+def set_lock_timeout(timeout_ms: int) -> None:
+    """Bounds the lock wait of the current transaction (PostgreSQL)."""
+    if connection.vendor != 'postgresql':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute('SET LOCAL lock_timeout = %s', [f'{timeout_ms}ms'])
+
+
+def is_lock_timeout(error: OperationalError) -> bool:
+    return getattr(error.__cause__, 'pgcode', None) == LOCK_NOT_AVAILABLE
+
+
+def add_seats_booked(seats_by_event: dict[int, int]) -> None:
+    """Adds the booked seats to the counters of the events in one UPDATE."""
+    Event.objects.filter(pk__in=seats_by_event).update(
+        seats_booked=F('seats_booked')
+        + Case(
+            *(
+                When(pk=event_id, then=Value(seats))
+                for event_id, seats in seats_by_event.items()
+            ),
+            default=Value(0),
+        )
+    )
 
 
 class EventService:  # noqa: WPS214
@@ -32,29 +89,65 @@ class EventService:  # noqa: WPS214
         Get custom-sorted events
         1. Current (UPCOMING), start_time
         2. Past (COMPLETED and CANCELLED), -start_time
+
+        Both halves are encoded in the stored Event.timeline_position,
+        so the ordering is served by the (timeline_position, id) index
+        without sorting and doesn't depend on the current time.
         """
-        return Event.objects.annotate(
-            status_order=Case(
-                When(status=EventStatus.UPCOMING, then=Value(0)),
-                When(status=EventStatus.COMPLETED, then=Value(1)),
-                When(status=EventStatus.CANCELLED, then=Value(1)),
-                output_field=IntegerField(),
-            ),
-            start_time_order=AbsEpoch(
-                ExpressionWrapper(
-                    expression=F('start_time') - timezone.now(),  # type: ignore
-                    output_field=IntegerField(),
-                )
-            ),
-        ).order_by(
-            'status_order',
-            'start_time_order',
+        return Event.objects.order_by('timeline_position', 'id')
+
+    @classmethod
+    def get_event_suggestions(cls, query: str, limit: int) -> QuerySet[Event]:
+        """
+        Autocomplete: the events most similar to the query by title or city.
+        """
+        return (
+            Event.objects.similar_to(query)
+            .only('id', 'title', 'city', 'start_time')
+            .order_by('-similarity', 'timeline_position')[:limit]
+        )
+
+    @classmethod
+    def get_events_page(
+        cls,
+        filters: EventFilterSchema,
+        pagination: KeysetPagination.Input,
+    ) -> cache.Payload:
+        """
+        Serialized page of the filtered events, read through the cache.
+        """
+        query = {
+            'filters': filters.model_dump(),
+            'pagination': pagination.model_dump(),
+        }
+        return cache.read_through(
+            lambda: cache.events_page_cache_key(query),
+            lambda: cls._get_events_page(filters, pagination),
         )
 
     @staticmethod
     def get_event_by_id(event_id: int) -> Event:
         return get_object_or_404(Event, id=event_id)
 
+    @classmethod
+    def get_event_data(cls, event_id: int) -> cache.Payload:
+        """Serialized event, read through the cache."""
+        return cache.read_through(
+            lambda: cache.event_cache_key(event_id),
+            lambda: cls._get_event_data(event_id),
+        )
+
+    @staticmethod
+    def finish_expired_events() -> int:
+        """Completes the events that started more than 2 hours ago."""
+        updated = Event.objects.filter(
+            status=EventStatus.UPCOMING,
+            start_time__lte=timezone.now() - timedelta(hours=2),
+        ).update(status=EventStatus.COMPLETED)
+        if updated:
+            cache.invalidate_events()
+        return updated
+
     @staticmethod
     def create_event(event_data: EventIn, organizer: User) -> Event:
         """
@@ -77,9 +170,33 @@ class EventService:  # noqa: WPS214
             organizer=organizer,
         )
         if created:
+            cache.invalidate_events(event.id)
+            EventService.schedule_reminder(event)
             return event
         raise HttpError(409, 'Such an event already exists')
 
+    @staticmethod
+    def schedule_reminder(event: Event) -> None:
+        """
+        Enqueues the reminder of the participants for EVENTS_REMINDER_LEAD
+        before the start of the (created or rescheduled) event if it is due
+        within EVENTS_REMINDER_HORIZON, the later reminders are scheduled
+        by the notify_upcoming_events sweep.
+
+        The task is bound to the start time, so the reminder of the event
+        rescheduled later does nothing. The reminders missed by the tasks
+        are sent by the sweep as well.
+        """
+        remind_at = event.start_time - settings.EVENTS_REMINDER_LEAD
+        if remind_at > timezone.now() + settings.EVENTS_REMINDER_HORIZON:
+            return
+        outbox.enqueue(
+            tasks.event_reminder,
+            event.pk,
+            event.start_time.isoformat(),
+            eta=remind_at,
+        )
+
     @staticmethod
     def update_event_status(
         event_id: int, status: str, organizer: User
@@ -87,6 +204,7 @@ class EventService:  # noqa: WPS214
         """
         Updates the status of the event.
         Only the organizer (who created the event) can change its status.
+        The participants of the cancelled event are notified.
         """
         event = get_object_or_404(Event, id=event_id)
         if event.organizer_id != organizer.id:
@@ -98,8 +216,16 @@ class EventService:  # noqa: WPS214
                 400,
                 f'Invalid status. Available statuses: {EventStatus.values}',
             )
+        cancelled = (
+            status == EventStatus.CANCELLED
+            and event.status != EventStatus.CANCELLED
+        )
         event.status = status
-        event.save(update_fields=['status', 'updated_at'])
+        with transaction.atomic():
+            event.save(update_fields=['status', 'updated_at'])
+            if cancelled:
+                outbox.enqueue(tasks.notify_event_cancelled, event.id)
+        cache.invalidate_events(event.id)
         return event
 
     @staticmethod
@@ -122,6 +248,7 @@ class EventService:  # noqa: WPS214
             )
 
         event.delete()
+        cache.invalidate_events(event_id)
 
     @classmethod
     def get_booking_available_events(cls) -> QuerySet[Event]:
@@ -131,34 +258,82 @@ class EventService:  # noqa: WPS214
         2. There are available seats, seats_available > 0
         """
         upcoming_events = cls.get_sorted_events().filter(status='upcoming')
-        return upcoming_events.filter(_seats_available__gte=1)  # type: ignore
+        return upcoming_events.filter(seats_available__gte=1)
 
-    @staticmethod
-    def create_booking(visitor: User, event_id: int, seats: int = 1) -> Booking:  # noqa: WPS238
-        try:
-            event = Event.objects.get(id=event_id)
-        except Event.DoesNotExist as error:
-            raise HttpError(400, f'{error}') from error
+    @classmethod
+    def create_booking(
+        cls, visitor: User, event_id: int, seats: int = 1
+    ) -> Booking:
+        """
+        Books seats of the event for the visitor.
 
-        if event.status not in EventStatus.UPCOMING:
-            raise HttpError(400, 'Event is not available for booking')
-        if event.seats_available < seats:
-            raise HttpError(
-                400,
-                'Not enough seats available ({seats}/{available})'.format(
-                    seats=seats, available=event.seats_available
-                ),
-            )
-        if Booking.objects.filter(user=visitor, event=event).exists():
-            raise HttpError(400, 'You have already booked this event')
+        The seats are reserved with a single conditional UPDATE of the event
+        row, so concurrent requests can't oversell the event. Waiting for
+        the row lock is bounded by BOOKING_LOCK_TIMEOUT_MS and retried
+        BOOKING_LOCK_RETRIES times before giving up with 409.
 
-        booking = Booking.objects.create(user=visitor, event=event, seats=seats)
-        send_booking_confirmation.delay(booking.id)
+        The seats held by the others are subtracted only by the lock-free
+        check before the UPDATE, a hold placed meanwhile can be outbooked.
+        """
+        event = cls._get_bookable_event(visitor, event_id, seats)
+        booking = cls._reserve_seats_with_retries(visitor, event, seats)
+        cache.invalidate_events(event.id)
         return booking
 
+    @classmethod
+    def create_bookings(
+        cls,
+        visitor: User,
+        booking_items: list[BookingItemIn],
+        *,
+        atomic: bool = True,
+    ) -> BatchBookingOut:
+        """
+        Books several events for the visitor in one transaction.
+
+        The events are validated with one query that also locks them in
+        the order of IDs, and the bookings are inserted with one
+        bulk_create. With `atomic` nothing is booked if any item fails,
+        otherwise the failed items are reported and the others are booked.
+        """
+        seats_by_event = {
+            booking_item.event_id: booking_item.seats
+            for booking_item in booking_items
+        }
+        try:
+            with transaction.atomic():
+                set_lock_timeout(settings.BOOKING_LOCK_TIMEOUT_MS)
+                errors = cls._check_batch(visitor, seats_by_event)
+                if atomic and errors:
+                    raise HttpError(
+                        400,
+                        '; '.join(failed_item.detail for failed_item in errors),
+                    )
+                for failed_item in errors:
+                    seats_by_event.pop(failed_item.event_id)
+                bookings = cls._book_batch(visitor, seats_by_event)
+        except (IntegrityError, OperationalError) as error:
+            if isinstance(error, OperationalError) and not is_lock_timeout(
+                error
+            ):
+                raise
+            booking_conflicts.inc()
+            raise HttpError(
+                409, 'The events are booked too intensively, try again'
+            ) from error
+        return BatchBookingOut.model_validate({
+            'bookings': bookings,
+            'errors': errors,
+        })
+
     @staticmethod
     def cancel_booking(visitor: User, event_id: int) -> None:
-        """Cancels the user's reservation for the specified event."""
+        """
+        Cancels the user's reservation for the specified event.
+
+        The freed seats are booked for the waitlisted users
+        in the same transaction.
+        """
         try:
             event = Event.objects.get(id=event_id)
         except Event.DoesNotExist as error:
@@ -169,8 +344,71 @@ class EventService:  # noqa: WPS214
             booking = Booking.objects.get(user=visitor, event=event)
         except Booking.DoesNotExist as error:
             raise HttpError(400, f'{error}') from error
-        booking.delete()
-        send_event_cancelled.delay(visitor.id, event.id)
+        with transaction.atomic():
+            deleted, _ = booking.delete()
+            if deleted:
+                Event.objects.filter(pk=event.pk).update(
+                    seats_booked=F('seats_booked') - booking.seats
+                )
+                WaitlistService.promote(event.pk)
+                cache.invalidate_events(event.id)
+            outbox.enqueue(tasks.send_event_cancelled, visitor.id, event.id)
+
+    @classmethod
+    def hold_seats(
+        cls, visitor: User, event_id: int, seats: int = 1
+    ) -> SeatHoldOut:
+        """
+        Holds the seats of the event for the visitor for EVENTS_HOLD_TTL.
+
+        The hold is placed in Valkey against the cached event, so the spike
+        of holds doesn't reach the database. Only the confirmed holds are
+        written there as bookings, the others expire by themselves.
+        """
+        event_data = cls.get_event_data(event_id)
+        if event_data['status'] != EventStatus.UPCOMING:
+            raise HttpError(400, 'Event is not available for booking')
+        seats_left = holds.place_hold(
+            event_id,
+            visitor.id,
+            seats,
+            available=event_data['seats_available'],
+        )
+        if seats_left is None:
+            raise HttpError(409, 'Not enough seats available to hold')
+        return SeatHoldOut(
+            event_id=event_id,
+            seats=seats,
+            seats_left=seats_left,
+            expires_at=timezone.now()
+            + timedelta(seconds=settings.EVENTS_HOLD_TTL),
+        )
+
+    @classmethod
+    def confirm_hold(cls, visitor: User, event_id: int) -> Booking:
+        """
+        Books the seats held by the visitor.
+
+        The hold is removed once the booking is committed, a failed
+        booking keeps it until its expiry.
+        """
+        seats, held = holds.get_hold(event_id, visitor.id)
+        if not seats:
+            raise HttpError(400, 'The hold has expired or does not exist')
+        event = cls._get_bookable_event(visitor, event_id, seats, held)
+        booking = cls._reserve_seats_with_retries(visitor, event, seats)
+        cache.invalidate_events(event.id)
+        # a failure is logged, the hold expires by itself then
+        transaction.on_commit(
+            lambda: holds.take_hold(event_id, visitor.id), robust=True
+        )
+        return booking
+
+    @staticmethod
+    def release_hold(visitor: User, event_id: int) -> None:
+        """Releases the seats held by the visitor before the expiry."""
+        if not holds.take_hold(event_id, visitor.id):
+            raise HttpError(400, 'The hold has expired or does not exist')
 
     @classmethod
     def get_user_upcoming_events(cls, visitor: User) -> QuerySet[Event]:
@@ -179,3 +417,311 @@ class EventService:  # noqa: WPS214
             start_time__gt=timezone.now(),
             status=EventStatus.UPCOMING,
         )
+
+    @staticmethod
+    def release_bookings(bookings: QuerySet[Booking]) -> None:
+        """
+        Takes the seats of the bookings deleted outside cancel_booking
+        (by the admin or the cascade of a deleted user) back from the
+        counters of their events and books them for the waitlisted users.
+
+        Runs in the transaction deleting the bookings, before they are
+        deleted.
+        """
+        seats_by_event = dict(
+            bookings.order_by()
+            .values('event_id')
+            .annotate(total=Sum('seats'))
+            .values_list('event_id', 'total')
+        )
+        add_seats_booked({
+            event_id: -seats for event_id, seats in seats_by_event.items()
+        })
+        for event_id in seats_by_event:
+            WaitlistService.promote(event_id)
+            cache.invalidate_events(event_id)
+
+    @staticmethod
+    def reconcile_seats_booked(*, dry_run: bool = False) -> list[int]:
+        """
+        Fixes the drift of the stored Event.seats_booked counters
+        against the sum of seats in the bookings table.
+
+        Returns the IDs of the events whose counter did not match.
+        """
+        actual_seats_booked = Coalesce(
+            Subquery(
+                Booking.objects.filter(event=OuterRef(PK))
+                .values('event')
+                .annotate(total=Sum('seats'))
+                .values('total')
+            ),
+            Value(0),
+        )
+        drifted_events = Event.objects.alias(
+            actual_seats_booked=actual_seats_booked,
+        ).exclude(seats_booked=F('actual_seats_booked'))
+        if dry_run:
+            return list(drifted_events.values_list(PK, flat=True))
+        with transaction.atomic():
+            drifted_ids = list(
+                drifted_events.select_for_update().values_list(PK, flat=True)
+            )
+            Event.objects.filter(pk__in=drifted_ids).update(
+                seats_booked=actual_seats_booked
+            )
+            for event_id in drifted_ids:
+                cache.invalidate_events(event_id)
+        return drifted_ids
+
+    @classmethod
+    def _get_events_page(
+        cls,
+        filters: EventFilterSchema,
+        pagination: KeysetPagination.Input,
+    ) -> cache.Payload:
+        page = KeysetPagination().paginate_queryset(
+            filters.filter(cls.get_sorted_events()), pagination
+        )
+        return EventPageOut.model_validate(page).model_dump(mode='json')
+
+    @classmethod
+    def _get_event_data(cls, event_id: int) -> cache.Payload:
+        event = cls.get_event_by_id(event_id)
+        return EventOut.from_orm(event).model_dump(mode='json')
+
+    @classmethod
+    def _check_batch(  # noqa: WPS210
+        cls, visitor: User, seats_by_event: dict[int, int]
+    ) -> list[BookingErrorOut]:
+        """Locks the events and returns the errors of the booking items."""
+        events = (
+            Event.objects.select_for_update()
+            .filter(pk__in=seats_by_event)
+            .annotate(
+                booked_by_visitor=Exists(
+                    Booking.objects.filter(event=OuterRef(PK), user=visitor)
+                )
+            )
+            .order_by(PK)
+            .in_bulk()
+        )
+        held_seats = holds.get_held_seats_many(list(events))
+        errors = {
+            event_id: cls._get_booking_error(
+                event_id,
+                seats,
+                events.get(event_id),
+                held_seats.get(event_id, 0),
+            )
+            for event_id, seats in seats_by_event.items()
+        }
+        return [
+            BookingErrorOut(event_id=event_id, detail=detail)
+            for event_id, detail in errors.items()
+            if detail
+        ]
+
+    @staticmethod
+    def _get_booking_error(
+        event_id: int, seats: int, event: Event | None, held: int
+    ) -> str | None:
+        if event is None:
+            return f'Event {event_id} does not exist'
+        if event.status != EventStatus.UPCOMING:
+            return f'Event {event_id} is not available for booking'
+        if event.booked_by_visitor:  # type: ignore
+            return f'You have already booked event {event_id}'
+        if event.seats_available - held < seats:
+            return f'Not enough seats available for event {event_id}'
+        return None
+
+    @staticmethod
+    def _book_batch(
+        visitor: User, seats_by_event: dict[int, int]
+    ) -> list[Booking]:
+        """Books the checked and locked events with the bulk queries."""
+        if not seats_by_event:
+            return []
+        bookings = Booking.objects.bulk_create(
+            Booking(user=visitor, event_id=event_id, seats=seats)
+            for event_id, seats in seats_by_event.items()
+        )
+        add_seats_booked(seats_by_event)
+        WaitlistEntry.objects.filter(
+            user=visitor, event_id__in=seats_by_event
+        ).delete()
+        for event_id in seats_by_event:
+            cache.invalidate_events(event_id)
+        outbox.enqueue(
+            tasks.send_booking_confirmations,
+            [booking.id for booking in bookings],
+        )
+        return bookings
+
+    @staticmethod
+    def _get_bookable_event(  # noqa: WPS238
+        visitor: User, event_id: int, seats: int, held: int | None = None
+    ) -> Event:
+        """
+        Cheap lock-free checks before reserving the seats, `held` are
+        the seats held by the others (looked up if not given).
+        """
+        try:
+            event = Event.objects.get(id=event_id)
+        except Event.DoesNotExist as error:
+            raise HttpError(400, f'{error}') from error
+
+        if event.status not in EventStatus.UPCOMING:
+            raise HttpError(400, 'Event is not available for booking')
+        # the seats held by the others are not available for booking
+        if held is None:
+            held = holds.get_held_seats(event.id)
+        available = event.seats_available - held
+        if available < seats:
+            raise HttpError(
+                400,
+                'Not enough seats available ({seats}/{available})'.format(
+                    seats=seats, available=available
+                ),
+            )
+        if Booking.objects.filter(user=visitor, event=event).exists():
+            booking_conflicts.inc()
+            raise HttpError(409, 'You have already booked this event')
+        return event
+
+    @classmethod
+    def _reserve_seats_with_retries(
+        cls, visitor: User, event: Event, seats: int
+    ) -> Booking:
+        for attempt in range(settings.BOOKING_LOCK_RETRIES + 1):
+            try:
+                return cls._reserve_seats(visitor, event, seats)
+            except OperationalError as error:
+                if not is_lock_timeout(error):
+                    raise
+                booking_lock_retries.inc()
+                time.sleep(random.random() * LOCK_RETRY_JITTER * attempt)  # noqa: S311
+        booking_conflicts.inc()
+        raise HttpError(409, 'The event is booked too intensively, try again')
+
+    @staticmethod
+    def _reserve_seats(visitor: User, event: Event, seats: int) -> Booking:
+        """
+        Atomically takes the seats of the event and creates the booking.
+
+        Nothing is written if there are not enough seats left or the visitor
+        has already booked the event.
+        """
+        try:
+            with transaction.atomic():
+                set_lock_timeout(settings.BOOKING_LOCK_TIMEOUT_MS)
+                started = time.perf_counter()
+                reserved = Event.objects.filter(
+                    pk=event.pk,
+                    status=EventStatus.UPCOMING,
+                    seats_available__gte=seats,
+                ).update(seats_booked=F('seats_booked') + seats)
+                waited_ms = (time.perf_counter() - started) * 1000
+                booking = None
+                if reserved:
+                    booking = Booking.objects.create(
+                        user=visitor, event=event, seats=seats
+                    )
+                    WaitlistEntry.objects.filter(
+                        user=visitor, event=event
+                    ).delete()
+                    outbox.enqueue(tasks.send_booking_confirmation, booking.id)
+        except IntegrityError as error:
+            booking_conflicts.inc()
+            raise HttpError(
+                409, 'You have already booked this event'
+            ) from error
+        # recorded once the event row is unlocked, the cache round trips
+        # of the metric never delay the other bookers
+        booking_lock_wait.observe(waited_ms)
+        if booking is None:
+            raise HttpError(400, 'Not enough seats available')
+        return booking
+
+
+class WaitlistService:
+    @staticmethod
+    def join_waitlist(  # noqa: WPS238
+        visitor: User, event_id: int, seats: int = 1
+    ) -> WaitlistEntry:
+        """
+        Puts the visitor on the waitlist of a fully booked event.
+
+        The seats are booked automatically when they are freed.
+        """
+        event = get_object_or_404(Event, id=event_id)
+        if event.status != EventStatus.UPCOMING:
+            raise HttpError(400, 'Event is not available for booking')
+        if event.seats_available - holds.get_held_seats(event.id) >= seats:
+            raise HttpError(400, 'The seats are available, book them instead')
+        if Booking.objects.filter(user=visitor, event=event).exists():
+            raise HttpError(409, 'You have already booked this event')
+        entry, created = WaitlistEntry.objects.get_or_create(
+            event=event, user=visitor, defaults={'seats': seats}
+        )
+        if not created:
+            raise HttpError(409, 'You are already on the waitlist')
+        return WaitlistEntry.objects.with_position().get(pk=entry.pk)
+
+    @staticmethod
+    def leave_waitlist(visitor: User, event_id: int) -> None:
+        deleted, _ = WaitlistEntry.objects.filter(
+            event_id=event_id, user=visitor
+        ).delete()
+        if not deleted:
+            raise HttpError(400, 'You are not on the waitlist')
+
+    @classmethod
+    def promote(cls, event_id: int) -> list[Booking]:
+        """
+        Books the free seats of the event for the waitlisted users.
+
+        Runs in the transaction that freed the seats and has locked the
+        event row by updating it, so the promotions are serialized. The
+        waitlist is served in the strict FIFO order: the promotion stops
+        at the first entry that doesn't fit into the free seats. Only the
+        upcoming events promote, the entries of the cancelled and
+        completed ones stay on the waitlist.
+        """
+        promoted = cls._get_promoted_entries(event_id)
+        if not promoted:
+            return []
+        bookings = Booking.objects.bulk_create(
+            Booking(event_id=event_id, user_id=entry.user_id, seats=entry.seats)
+            for entry in promoted
+        )
+        WaitlistEntry.objects.filter(
+            pk__in=[entry.pk for entry in promoted]
+        ).delete()
+        add_seats_booked({event_id: sum(entry.seats for entry in promoted)})
+        outbox.enqueue(
+            tasks.send_booking_confirmations,
+            [booking.id for booking in bookings],
+        )
+        return bookings
+
+    @staticmethod
+    def _get_promoted_entries(event_id: int) -> list[WaitlistEntry]:
+        """The first waitlist entries fitting into the free seats."""
+        available = (
+            Event.objects.filter(pk=event_id, status=EventStatus.UPCOMING)
+            .values_list('seats_available', flat=True)
+            .first()
+        )
+        if available is None:
+            return []
+        available -= holds.get_held_seats(event_id)
+        promoted = []
+        waitlist = WaitlistEntry.objects.filter(event_id=event_id)
+        for entry in waitlist.order_by('id')[: max(available, 0)]:
+            if entry.seats > available:
+                break
+            available -= entry.seats
+            promoted.append(entry)
+        return promoted
@@ -0,0 +1,16 @@
+from typing import Any
+
+from django.contrib.auth.models import User
+
+from events.models import Booking
+from events.services import EventService
+
+
+def release_user_bookings(
+    sender: type[User], instance: User, **kwargs: Any
+) -> None:
+    """
+    Takes the seats of the deleted user back from the booked events before
+    the bookings are deleted by the cascade.
+    """
+    EventService.release_bookings(Booking.objects.filter(user_id=instance.pk))
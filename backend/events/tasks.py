@@ -1,29 +1,46 @@
-from datetime import timedelta
-
 from celery import shared_task
+from django.conf import settings
 from django.utils import timezone
 from notifications.tasks import event_reminder
 
 from events.models import Event, EventStatus
+from events.services import EventService
 
 
 @shared_task(name='events.tasks.finish_expired_events')
 def finish_expired_events() -> str:
-    updated = Event.objects.filter(
-        status=EventStatus.UPCOMING,
-        start_time__lte=timezone.now() - timedelta(hours=2),
-    ).update(status=EventStatus.COMPLETED)
+    updated = EventService.finish_expired_events()
     return f'Finished {updated} events'
 
 
+@shared_task(name='events.tasks.reconcile_seats_booked')
+def reconcile_seats_booked() -> str:
+    """Fixes the seat counters drifted by the changes bypassing them."""
+    drifted_ids = EventService.reconcile_seats_booked()
+    return f'Reconciled {len(drifted_ids)} events: {drifted_ids}'
+
+
 @shared_task(name='events.tasks.notify_upcoming_events')
-def notify_upcoming_events(accuracy_minute: int = 5) -> str:
-    upcoming_start = timezone.now() + timedelta(hours=1)
-    events_to_notify = Event.objects.filter(
-        start_time__gte=upcoming_start,
-        start_time__lt=upcoming_start + timedelta(minutes=accuracy_minute),
-        status=EventStatus.UPCOMING,
+def notify_upcoming_events() -> str:
+    """
+    Schedules the reminders due within EVENTS_REMINDER_HORIZON and sends
+    the ones missed by the scheduled tasks (of the events starting within
+    EVENTS_REMINDER_LEAD that are not reminded yet).
+    """
+    now = timezone.now()
+    events = list(
+        Event.objects.filter(
+            status=EventStatus.UPCOMING,
+            reminded_at__isnull=True,
+            start_time__gt=now,
+            start_time__lte=now
+            + settings.EVENTS_REMINDER_LEAD
+            + settings.EVENTS_REMINDER_HORIZON,
+        ).values_list('pk', 'start_time')
     )
-    for event in events_to_notify:
-        event_reminder.delay(event.id)
-    return f'Sent reminders for {events_to_notify.count()} events'
+    for event_id, start_time in events:
+        event_reminder.apply_async(
+            (event_id, start_time.isoformat()),
+            eta=start_time - settings.EVENTS_REMINDER_LEAD,
+        )
+    return f'Scheduled reminders for {len(events)} events'
@@ -1,6 +1,10 @@
 from django.contrib import admin
 
-from notifications.models import Notification
+from notifications.models import (
+    Notification,
+    NotificationAttempt,
+    OutboxMessage,
+)
 
 
 pk = 'pk'
@@ -15,3 +19,24 @@ class NotificationAdmin(admin.ModelAdmin):
     search_fields = list_display
     list_filter = ('type', 'status')
     ordering = ('created_at',)
+
+
+@admin.register(NotificationAttempt)
+class NotificationAttemptAdmin(admin.ModelAdmin):
+    """Admin interface configuration for the NotificationAttempt model."""
+
+    list_display = (pk, 'notification_id', 'attempt', 'status_code')
+    list_display_links = list_display
+    search_fields = ('notification_id',)
+    list_filter = ('status_code',)
+    ordering = ('-created_at',)
+
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    """Admin interface configuration for the OutboxMessage model."""
+
+    list_display = (pk, 'task_name', 'created_at')
+    list_display_links = list_display
+    search_fields = ('task_name',)
+    ordering = (pk,)
@@ -0,0 +1,66 @@
+from typing import cast
+
+from config.auth import Principal
+from config.pagination import KeysetPagination
+from django.db.models import QuerySet
+from django.http import HttpRequest
+from ninja import Query, Router
+from ninja.pagination import paginate
+
+from notifications import unread
+from notifications.models import Notification, NotificationStatus
+from notifications.schemas import (
+    MarkReadIn,
+    MarkReadOut,
+    NotificationFilterIn,
+    NotificationOut,
+    UnreadCountOut,
+)
+from notifications.services import NotificationService
+
+
+DEFAULT_QUERY = Query(...)
+
+router = Router()
+
+
+@router.get('/', response=list[NotificationOut])
+@paginate(KeysetPagination)
+def list_notifications(
+    request: HttpRequest, filters: NotificationFilterIn = DEFAULT_QUERY
+) -> QuerySet[Notification]:
+    """
+    The inbox of the user, newest first.
+
+    The list is paginated with an opaque cursor: pass `next` of the
+    response as `cursor` to get the next page.
+    """
+    user = cast(Principal, request.auth)  # type: ignore
+    return NotificationService.get_user_notifications(
+        user_id=user.id,
+        status=NotificationStatus.SENT if filters.unread else None,
+    )
+
+
+@router.get('/unread-count/', response=UnreadCountOut)
+def get_unread_count(request: HttpRequest) -> UnreadCountOut:
+    """
+    Number of the unread notifications, it doesn't query the database.
+    """
+    user = cast(Principal, request.auth)  # type: ignore
+    return UnreadCountOut(unread=unread.get_unread_count(user.id))
+
+
+@router.post('/read/', response=MarkReadOut)
+def mark_as_read(request: HttpRequest, read_data: MarkReadIn) -> MarkReadOut:
+    """
+    Marks the notifications with the given `ids` as read,
+    all the unread notifications without them.
+    """
+    user_id = cast(Principal, request.auth).id  # type: ignore
+    marked_count = NotificationService.mark_many_as_read(
+        user_id=user_id, notification_ids=read_data.ids
+    )
+    return MarkReadOut(
+        marked=marked_count, unread=unread.get_unread_count(user_id)
+    )
@@ -0,0 +1,136 @@
+import hashlib
+import json
+import logging
+import uuid
+from typing import NamedTuple
+
+from celery import current_app
+from config.valkey import get_client
+from django.conf import settings
+from redis import RedisError
+
+from notifications.models import NotificationType
+
+
+logger = logging.getLogger(__name__)
+
+DIGEST_KEY = 'notifications:digest:{user_id}'
+# The id of the window, set while the digest of the user is scheduled to be
+# sent. It expires by itself, so a lost task is scheduled again by the next
+# notification.
+SCHEDULED_KEY = 'notifications:digest:{user_id}:scheduled'
+DEDUP_KEY = 'digest:{user_id}:{window_id}'
+SEND_TASK = 'notifications.tasks.send_digest'
+# The time (s) the digest outlives its window if its task is delayed.
+DIGEST_GRACE = 300
+# Removes the sent notifications, the digest stays scheduled (in the new
+# window) if newer ones were buffered meanwhile.
+REMOVE_SENT = (
+    "redis.call('LTRIM', KEYS[1], ARGV[1], -1) "
+    "if redis.call('LLEN', KEYS[1]) > 0 then "
+    "redis.call('SET', KEYS[2], ARGV[2], 'EX', ARGV[3]) return 1 end "
+    "redis.call('DEL', KEYS[2]) return 0"
+)
+
+
+class Draft(NamedTuple):
+    """A notification buffered before its row is created."""
+
+    notification_type: NotificationType
+    title: str
+    message: str
+    related_event_id: int | None = None
+
+
+def coalesce(user_id: int, draft: Draft) -> bool:
+    """
+    Buffers the notification into the digest of the user, the first one
+    schedules the digest to be sent at the end of the window.
+
+    Returns False if the notification must be sent on its own: its type
+    is immediate, the digests are disabled or Valkey is unavailable.
+    """
+    window = settings.NOTIFICATIONS_DIGEST_WINDOW
+    if (
+        window <= 0
+        or draft.notification_type in settings.NOTIFICATIONS_IMMEDIATE_TYPES
+    ):
+        return False
+    key = DIGEST_KEY.format(user_id=user_id)
+    try:
+        with get_client().pipeline() as pipeline:
+            pipeline.rpush(key, json.dumps(draft))
+            pipeline.expire(key, window + DIGEST_GRACE)
+            pipeline.set(
+                SCHEDULED_KEY.format(user_id=user_id),
+                uuid.uuid4().hex,
+                ex=window + DIGEST_GRACE,
+                nx=True,
+            )
+            is_first = pipeline.execute()[-1]
+    except RedisError:
+        logger.warning('Unable to coalesce the notification', exc_info=True)
+        return False
+    if is_first:
+        _schedule(user_id, window)
+    return True
+
+
+def get_drafts(user_id: int) -> list[Draft]:
+    """The notifications buffered for the user, oldest first."""
+    raw_drafts = get_client().lrange(DIGEST_KEY.format(user_id=user_id), 0, -1)
+    return [Draft(*json.loads(raw)) for raw in raw_drafts]  # type: ignore
+
+
+def get_dedup_key(user_id: int, drafts: list[Draft]) -> str:
+    """
+    The dedup key of the digest of the buffered notifications: the id of
+    its window, so a retried task finds the digest it has created.
+    The digest sent after its window expired is keyed by the drafts.
+    """
+    window_id = get_client().get(SCHEDULED_KEY.format(user_id=user_id))
+    if window_id is None:
+        window_id = hashlib.sha256(json.dumps(drafts).encode()).hexdigest()
+    elif isinstance(window_id, bytes):
+        window_id = window_id.decode()
+    return DEDUP_KEY.format(user_id=user_id, window_id=window_id)
+
+
+def remove_drafts(user_id: int, sent_count: int) -> None:
+    """
+    Removes the sent notifications from the digest. The ones buffered
+    after they were read are sent by the next digest.
+    """
+    remove_sent = get_client().register_script(REMOVE_SENT)
+    window = settings.NOTIFICATIONS_DIGEST_WINDOW
+    if remove_sent(
+        keys=[
+            DIGEST_KEY.format(user_id=user_id),
+            SCHEDULED_KEY.format(user_id=user_id),
+        ],
+        args=[sent_count, uuid.uuid4().hex, window + DIGEST_GRACE],
+    ):
+        _schedule(user_id, window)
+
+
+def merge(drafts: list[Draft]) -> Draft:
+    """One notification saying what all the buffered ones say."""
+    if len(drafts) == 1:
+        return drafts[0]
+    event_ids = {draft.related_event_id for draft in drafts}
+    return Draft(
+        notification_type=NotificationType.DIGEST,
+        title=f'You have {len(drafts)} new notifications',
+        message='\n\n'.join(
+            f'{draft.title}\n{draft.message}' for draft in drafts
+        ),
+        related_event_id=event_ids.pop() if len(event_ids) == 1 else None,
+    )
+
+
+def _schedule(user_id: int, window: int) -> None:
+    try:
+        current_app.send_task(SEND_TASK, args=(user_id,), countdown=window)
+    except Exception:
+        logger.exception('Unable to schedule the digest of %s', user_id)
+        get_client().delete(SCHEDULED_KEY.format(user_id=user_id))
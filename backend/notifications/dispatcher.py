@@ -0,0 +1,64 @@
+import time
+
+from notifications.models import NotificationStatus
+from notifications.services import (
+    NotificationService,
+    send_grpc_notifications,
+    send_grpc_notifications_concurrently,
+)
+
+
+def dispatch_pending_notifications(chunk_size: int) -> tuple[int, int]:
+    """
+    Claims, sends and finishes the pending notifications chunk by chunk
+    until none are left. Returns the numbers of the sent and failed ones.
+
+    Only one chunk is kept in memory and the parallel dispatchers claim
+    disjoint chunks, a notification is finished by its dispatcher only.
+    """
+    sent_count = 0
+    failed_count = 0
+    NotificationService.release_expired_claims()
+    notifications = NotificationService.claim_pending_notifications(chunk_size)
+    while notifications:
+        chunk_sent_count = send_grpc_notifications_concurrently(
+            notifications, from_status=NotificationStatus.SENDING
+        )
+        sent_count += chunk_sent_count
+        failed_count += len(notifications) - chunk_sent_count
+        notifications = NotificationService.claim_pending_notifications(
+            chunk_size
+        )
+    return sent_count, failed_count
+
+
+def replay_dead_notifications(
+    batch_size: int, rate: float, limit: int | None = None
+) -> tuple[int, int]:
+    """
+    Sends the dead-lettered notifications again batch by batch, at most
+    `rate` notifications a second and `limit` in total if it is given.
+    Returns the numbers of the sent and failed ones.
+
+    The notifications are replayed in the order of their ids, none twice
+    by the same run: a dead-lettered one failed again is dead-lettered
+    back at once.
+    """
+    sent_count = 0
+    replayed_count = 0
+    last_id = 0
+    while limit is None or replayed_count < limit:
+        notifications = NotificationService.claim_dead_notifications(
+            min(batch_size, limit - replayed_count) if limit else batch_size,
+            after_id=last_id,
+        )
+        if not notifications:
+            break
+        next_batch_at = time.monotonic() + len(notifications) / rate
+        sent_count += send_grpc_notifications(
+            notifications, from_status=NotificationStatus.SENDING
+        )
+        replayed_count += len(notifications)
+        last_id = notifications[-1].pk
+        time.sleep(max(0, next_batch_at - time.monotonic()))
+    return sent_count, replayed_count - sent_count
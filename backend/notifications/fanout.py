@@ -0,0 +1,113 @@
+import logging
+from typing import NamedTuple
+
+from celery import chord, signature
+from django.db import transaction
+from django.utils import timezone
+from events.models import Booking
+
+from notifications.models import (
+    Notification,
+    NotificationStatus,
+    NotificationType,
+)
+
+
+logger = logging.getLogger(__name__)
+
+CHUNK_TASK = 'notifications.tasks.notify_participants_chunk'
+SUMMARY_TASK = 'notifications.tasks.summarize_fan_out'
+
+
+class FanOut(NamedTuple):
+    """The same notification to all the participants of the event."""
+
+    event_id: int
+    notification_type: NotificationType
+    title: str
+    message: str
+    dedup_key: str | None = None
+
+
+def get_chunks(event_id: int, chunk_size: int) -> list[tuple[int, int]]:
+    """
+    Splits the bookings of the event into the keyset ranges
+    (after_pk, last_pk] of `chunk_size` bookings.
+    """
+    booking_ids = list(
+        Booking.objects.filter(event_id=event_id)
+        .order_by('pk')
+        .values_list('pk', flat=True)
+    )
+    last_ids = booking_ids[chunk_size - 1 :: chunk_size]
+    if len(booking_ids) % chunk_size:
+        last_ids.append(booking_ids[-1])
+    return list(zip([0, *last_ids], last_ids, strict=False))
+
+
+def create_chunk(
+    fan_out: FanOut,
+    after_pk: int,
+    last_pk: int,
+    status: NotificationStatus = NotificationStatus.PENDING,
+) -> list[Notification]:
+    """
+    Creates the notifications of the participants booked in the range
+    (after_pk, last_pk], skipping the ones already notified with
+    the dedup key.
+
+    The bookings of the range are locked until the commit, so the same
+    chunk processed twice at once waits and creates nothing.
+    """
+    claimed_at = (
+        timezone.now() if status == NotificationStatus.SENDING else None
+    )
+    with transaction.atomic():
+        user_ids = list(
+            Booking.objects.filter(
+                event_id=fan_out.event_id, pk__gt=after_pk, pk__lte=last_pk
+            )
+            .order_by('pk')
+            .select_for_update()
+            .values_list('user_id', flat=True)
+        )
+        if fan_out.dedup_key:
+            notified = set(
+                Notification.objects.filter(
+                    dedup_key=fan_out.dedup_key, user_id__in=user_ids
+                ).values_list('user_id', flat=True)
+            )
+            user_ids = [
+                user_id for user_id in user_ids if user_id not in notified
+            ]
+        return Notification.objects.bulk_create(
+            Notification(
+                user_id=user_id,
+                type=fan_out.notification_type,
+                status=status,
+                claimed_at=claimed_at,
+                title=fan_out.title,
+                message=fan_out.message,
+                related_event_id=fan_out.event_id,
+                dedup_key=fan_out.dedup_key,
+            )
+            for user_id in user_ids
+        )
+
+
+def start_fan_out(fan_out: FanOut, chunk_size: int) -> int:
+    """
+    Notifies the participants in parallel: the chunks are sent by a group
+    of tasks, a callback sums their sent and failed counts up.
+    Returns the number of the chunks.
+    """
+    chunks = get_chunks(fan_out.event_id, chunk_size)
+    if chunks:
+        chord(
+            signature(CHUNK_TASK, args=(fan_out._asdict(), after_pk, last_pk))
+            for after_pk, last_pk in chunks
+        )(signature(SUMMARY_TASK, args=(fan_out.dedup_key,)))
+    logger.info(
+        'Fan-out %s started with %s chunks', fan_out.dedup_key, len(chunks)
+    )
+    return len(chunks)
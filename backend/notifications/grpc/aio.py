@@ -0,0 +1,130 @@
+# mypy: ignore-errors
+
+import asyncio
+import logging
+import os
+import threading
+import time
+
+import grpc
+from django.conf import settings
+
+from notifications.grpc import notyfy_pb2_grpc
+from notifications.grpc.channels import get_channel_options
+from notifications.grpc.client import Delivery, build_message, failed_delivery
+from notifications.models import Notification
+
+
+logger = logging.getLogger(__name__)
+
+# The event loop of every thread with the channel living in it.
+loop_local = threading.local()
+
+
+def send_notifications_concurrently(
+    notifications: list[Notification],
+    max_in_flight: int | None = None,
+    timeout: float | None = None,
+) -> dict[int, Delivery]:
+    """
+    Sends the notifications with concurrent unary calls.
+
+    At most `max_in_flight` calls wait for the server at the same time
+    and every call has its own deadline, so a slow notification fails
+    alone. Returns the delivery by the notification id.
+
+    It runs the event loop of the thread, so it is called from the sync
+    code (celery tasks) only. The loop and its channel are kept for the
+    next calls, the keepalive pings hold the connection open in between.
+    """
+    if not notifications:
+        return {}
+    return _get_runner().run(
+        _send_all(
+            notifications,
+            max_in_flight or settings.GRPC_MAX_IN_FLIGHT,
+            timeout or settings.GRPC_CALL_TIMEOUT,
+        )
+    )
+
+
+def _get_runner() -> asyncio.Runner:
+    # A forked process never uses the loop and the channel inherited
+    # from the parent, their connections belong to the parent.
+    if getattr(loop_local, 'pid', None) != os.getpid():
+        loop_local.pid = os.getpid()
+        loop_local.runner = asyncio.Runner()
+        loop_local.channel = None
+    return loop_local.runner
+
+
+def _get_stub() -> notyfy_pb2_grpc.NotificationSenderStub:
+    # The channel is bound to the loop it is created in.
+    if loop_local.channel is None:
+        logger.debug('Opening the async gRPC channel')
+        loop_local.channel = grpc.aio.insecure_channel(
+            f'{settings.GRPC_SERVER_HOST}:{settings.GRPC_SERVER_PORT}',
+            options=get_channel_options(),
+        )
+    return notyfy_pb2_grpc.NotificationSenderStub(loop_local.channel)
+
+
+async def _send_all(
+    notifications: list[Notification], max_in_flight: int, timeout: float
+) -> dict[int, Delivery]:
+    semaphore = asyncio.Semaphore(max_in_flight)
+    stub = _get_stub()
+    deliveries = await asyncio.gather(
+        *(
+            _send_one(stub, semaphore, notification, timeout)
+            for notification in notifications
+        )
+    )
+    delivered = dict(
+        zip(
+            (notification.pk for notification in notifications),
+            deliveries,
+            strict=True,
+        )
+    )
+    logger.debug(
+        'gRPC notifications sent: %s of %s',
+        sum(delivery.success for delivery in delivered.values()),
+        len(delivered),
+    )
+    return delivered
+
+
+async def _send_one(
+    stub: notyfy_pb2_grpc.NotificationSenderStub,
+    semaphore: asyncio.Semaphore,
+    notification: Notification,
+    timeout: float,
+) -> Delivery:
+    async with semaphore:
+        started = time.perf_counter()
+        try:
+            response = await stub.send_notification(
+                build_message(notification), timeout=timeout
+            )
+        except grpc.aio.AioRpcError as rpc_error:
+            logger.warning(
+                'gRPC error of the notification %s: %s: %s',
+                notification.pk,
+                rpc_error.code(),
+                rpc_error.details(),
+            )
+            return failed_delivery(rpc_error, started)
+        except Exception as error:
+            # Reported as the failed delivery like the sync client does,
+            # so one broken notification never aborts the whole batch.
+            logger.exception(
+                'Error sending the notification %s via gRPC', notification.pk
+            )
+            return failed_delivery(error, started)
+    return Delivery(
+        success=response.success,
+        status_code=grpc.StatusCode.OK.name,
+        latency_ms=(time.perf_counter() - started) * 1000,
+        error='' if response.success else response.message,
+    )
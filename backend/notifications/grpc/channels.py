@@ -0,0 +1,106 @@
+# mypy: ignore-errors
+
+import itertools
+import logging
+import os
+import threading
+import weakref
+
+import grpc
+from django.conf import settings
+
+from notifications.grpc import notyfy_pb2_grpc
+
+
+logger = logging.getLogger(__name__)
+
+
+def get_channel_options() -> list[tuple[str, int]]:
+    """
+    Options of the long-lived channels.
+
+    Keepalive pings detect the dead connections of the idle channels
+    (the server must permit them), the reconnects are backed off and
+    the local subchannel pool gives every channel its own connection.
+    """
+    return [
+        ('grpc.keepalive_time_ms', settings.GRPC_KEEPALIVE_TIME_MS),
+        ('grpc.keepalive_timeout_ms', settings.GRPC_KEEPALIVE_TIMEOUT_MS),
+        ('grpc.keepalive_permit_without_calls', 1),
+        ('grpc.http2.max_pings_without_data', 0),
+        ('grpc.initial_reconnect_backoff_ms', 1000),
+        ('grpc.min_reconnect_backoff_ms', 1000),
+        ('grpc.max_reconnect_backoff_ms', 30000),
+        ('grpc.use_local_subchannel_pool', 1),
+    ]
+
+
+class ChannelPool:
+    """
+    Round-robin pool of the channels of the worker process.
+
+    The channels are created on the first call and live as long as
+    the process: an IDLE channel reconnects by itself on the next call.
+    A forked process (celery prefork) never uses the inherited channels,
+    it drops them and creates its own ones.
+    """
+
+    def __init__(self, target: str, size: int) -> None:
+        self._target = target
+        self._size = max(size, 1)
+        self._lock = threading.Lock()
+        self._channels: list[grpc.Channel] = []
+        self._stubs: list[notyfy_pb2_grpc.NotificationSenderStub] = []
+        self._counter = itertools.count()
+        self._pid = os.getpid()
+        pool = weakref.ref(self)
+        os.register_at_fork(after_in_child=lambda: _forget_channels(pool))
+
+    def get_stub(self) -> notyfy_pb2_grpc.NotificationSenderStub:
+        if self._pid != os.getpid():
+            self.forget()
+        stubs = self._stubs
+        if not stubs:
+            stubs = self._connect()
+        return stubs[next(self._counter) % len(stubs)]
+
+    def close(self) -> None:
+        with self._lock:
+            for channel in self._channels:
+                channel.close()
+            self._channels = []
+            self._stubs = []
+
+    def forget(self) -> None:
+        """
+        Drops the channels inherited from the parent process without
+        closing them, their connections belong to the parent.
+        """
+        self._lock = threading.Lock()
+        self._channels = []
+        self._stubs = []
+        self._pid = os.getpid()
+
+    def _connect(self) -> list[notyfy_pb2_grpc.NotificationSenderStub]:
+        with self._lock:
+            if not self._stubs:
+                logger.debug(
+                    'Opening %s gRPC channels to %s', self._size, self._target
+                )
+                self._channels = [
+                    grpc.insecure_channel(
+                        self._target, options=get_channel_options()
+                    )
+                    for _ in range(self._size)
+                ]
+                self._stubs = [
+                    notyfy_pb2_grpc.NotificationSenderStub(channel)
+                    for channel in self._channels
+                ]
+            return self._stubs
+
+
+def _forget_channels(pool: 'weakref.ref[ChannelPool]') -> None:
+    channel_pool = pool()
+    if channel_pool is not None:
+        channel_pool.forget()
@@ -1,12 +1,15 @@
 # mypy: ignore-errors
 
 import logging
+import time
+from typing import NamedTuple
 
 import grpc
 from django.conf import settings
 
-from notifications.grpc import notyfy_pb2, notyfy_pb2_grpc
-from notifications.models import NotificationType
+from notifications.grpc import notyfy_pb2
+from notifications.grpc.channels import ChannelPool
+from notifications.models import Notification, NotificationType
 
 
 logger = logging.getLogger(__name__)
@@ -20,13 +23,89 @@ notification_type_mapping = {
         notyfy_pb2.NotificationType.EVENT_CANCELLED
     ),
     NotificationType.EVENT_UPDATED: notyfy_pb2.NotificationType.EVENT_UPDATED,
+    NotificationType.DIGEST: notyfy_pb2.NotificationType.DIGEST,
 }
 
 
+class Delivery(NamedTuple):
+    """The result of a delivery attempt of a notification."""
+
+    success: bool
+    # The name of the gRPC status code of the call, OK if it succeeded.
+    status_code: str
+    latency_ms: float
+    error: str = ''
+
+
+def failed_delivery(error: Exception, started: float) -> Delivery:
+    """The delivery failed by the exception raised after `started`."""
+    if isinstance(error, grpc.RpcError):
+        return Delivery(
+            success=False,
+            status_code=error.code().name,
+            latency_ms=(time.perf_counter() - started) * 1000,
+            error=error.details() or '',
+        )
+    return Delivery(
+        success=False,
+        status_code=grpc.StatusCode.UNKNOWN.name,
+        latency_ms=(time.perf_counter() - started) * 1000,
+        error=str(error),
+    )
+
+
+def reported_delivery(
+    status: notyfy_pb2.DeliveryStatus | None, latency_ms: float
+) -> Delivery:
+    """The delivery of a streamed notification reported by the server."""
+    if status is None:
+        return Delivery(
+            success=False,
+            status_code=grpc.StatusCode.OK.name,
+            latency_ms=latency_ms,
+            error='Not reported by the server',
+        )
+    return Delivery(
+        success=status.success,
+        status_code=grpc.StatusCode.OK.name,
+        latency_ms=latency_ms,
+        error='' if status.success else status.message,
+    )
+
+
+def get_stream_timeout(size: int) -> float:
+    """
+    The deadline (s) of the stream of `size` notifications.
+
+    It grows with the stream but stays well below the claim timeout, so
+    the call fails before the claimed notifications are released and
+    sent again by another dispatcher.
+    """
+    return min(
+        settings.GRPC_CALL_TIMEOUT + size * settings.GRPC_STREAM_ITEM_TIMEOUT,
+        settings.NOTIFICATIONS_CLAIM_TIMEOUT / 3,
+    )
+
+
+def build_message(notification: Notification) -> notyfy_pb2.Notification:
+    return notyfy_pb2.Notification(
+        id=notification.pk,
+        user_id=notification.user_id,
+        type=notification_type_mapping.get(
+            notification.type,
+            notyfy_pb2.NotificationType.EVENT_REMINDER,
+        ),
+        title=notification.title,
+        message=notification.message,
+    )
+
+
 class NotificationGrpcClient:
     def __init__(self) -> None:
-        self._channel = None
-        self._stub = None
+        self._pool = ChannelPool(
+            target=f'{settings.GRPC_SERVER_HOST}:{settings.GRPC_SERVER_PORT}',
+            size=settings.GRPC_CHANNEL_POOL_SIZE,
+        )
 
     def send_notification(
         self,
@@ -35,12 +114,11 @@ class NotificationGrpcClient:
         notification_type: str,
         title: str,
         message: str,
-    ) -> bool:
+    ) -> Delivery:
         notification_type_enum = notification_type_mapping.get(
             notification_type,
             notyfy_pb2.NotificationType.EVENT_REMINDER,
         )
-        self._ensure_connection()
         notification_pb = notyfy_pb2.Notification(
             id=notification_id,
             user_id=user_id,
@@ -48,36 +126,65 @@ class NotificationGrpcClient:
             title=title,
             message=message,
         )
+        started = time.perf_counter()
         try:
-            response = self._stub.send_notification(notification_pb)
+            response = self._pool.get_stub().send_notification(
+                notification_pb, timeout=settings.GRPC_CALL_TIMEOUT
+            )
         except grpc.RpcError as rpc_error:
             logger.exception(
                 'gRPC error: %s: %s', rpc_error.code(), rpc_error.details()
             )
-            return False
-        except Exception:
+            return failed_delivery(rpc_error, started)
+        except Exception as error:
             logger.exception('Error sending notification via gRPC')
-            return False
+            return failed_delivery(error, started)
         else:
             logger.debug(
                 'gRPC response: success=%s, message=%s',
                 response.success,
                 response.message,
             )
-            return response.success
-
-    def _ensure_connection(self) -> None:
-        if (
-            self._channel is None
-            or self._channel.connectivity_state(try_to_connect=False)
-            != grpc.ChannelConnectivity.READY
-        ):
-            server_addr = (
-                f'{settings.GRPC_SERVER_HOST}:{settings.GRPC_SERVER_PORT}'
+            return Delivery(
+                success=response.success,
+                status_code=grpc.StatusCode.OK.name,
+                latency_ms=(time.perf_counter() - started) * 1000,
+                error='' if response.success else response.message,
+            )
+
+    def send_notifications(
+        self, notifications: list[Notification]
+    ) -> dict[int, Delivery]:
+        """
+        Streams the notifications to the server in one call.
+
+        Returns the delivery by the notification id, all of them are failed
+        when the call itself fails or exceeds its deadline. The latency is
+        the one of the call.
+        """
+        if not notifications:
+            return {}
+        started = time.perf_counter()
+        try:
+            response = self._pool.get_stub().send_notifications(
+                (build_message(notification) for notification in notifications),
+                timeout=get_stream_timeout(len(notifications)),
+            )
+        except Exception as error:
+            logger.exception('Error sending notifications via gRPC')
+            return dict.fromkeys(
+                (notification.pk for notification in notifications),
+                failed_delivery(error, started),
+            )
+        logger.debug('gRPC response: received=%s', response.received)
+        latency_ms = (time.perf_counter() - started) * 1000
+        statuses = {status.id: status for status in response.statuses}
+        return {
+            notification.pk: reported_delivery(
+                statuses.get(notification.pk), latency_ms
             )
-            logger.debug('Connecting to gRPC server at %s', server_addr)
-            self._channel = grpc.insecure_channel(server_addr)
-            self._stub = notyfy_pb2_grpc.NotificationSenderStub(self._channel)
+            for notification in notifications
+        }
 
 
 grpc_client = NotificationGrpcClient()
@@ -0,0 +1,79 @@
+import time
+from collections.abc import Callable
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from notifications.grpc.aio import send_notifications_concurrently
+from notifications.grpc.client import Delivery, grpc_client
+from notifications.models import Notification, NotificationType
+
+
+Deliver = Callable[[list[Notification]], dict[int, Delivery]]
+
+
+def build_notifications(count: int) -> list[Notification]:
+    """Unsaved notifications, the benchmark doesn't touch the database."""
+    return [
+        Notification(
+            id=index,
+            user_id=index,
+            type=NotificationType.EVENT_REMINDER,
+            title=f'Benchmark {index}',
+            message='The event will start in an hour',
+        )
+        for index in range(1, count + 1)
+    ]
+
+
+def send_sequentially(
+    notifications: list[Notification],
+) -> dict[int, Delivery]:
+    """The delivery as it was before the batched and concurrent clients."""
+    return {
+        notification.pk: grpc_client.send_notification(
+            notification_id=notification.pk,
+            user_id=notification.user_id,
+            notification_type=notification.type,
+            title=notification.title,
+            message=notification.message,
+        )
+        for notification in notifications
+    }
+
+
+def measure(deliver: Deliver, notifications: list[Notification]) -> str:
+    """Reports the throughput and the number of the failed deliveries."""
+    started = time.perf_counter()
+    delivered = deliver(notifications)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    throughput = len(notifications) * 1000 / elapsed_ms
+    failed_count = sum(not delivery.success for delivery in delivered.values())
+    return (
+        f'{elapsed_ms:>10.2f} ms {throughput:>10.0f}/s {failed_count:>6} failed'
+    )
+
+
+class Command(BaseCommand):
+    """Compares the throughput of the gRPC notification clients."""
+
+    help = (
+        'Sends the notifications to the gRPC server (run the local '
+        'notify_grpc_service first) sequentially, over one stream and '
+        'with concurrent async calls, and reports the throughput.'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--count', type=int, default=2000)
+        parser.add_argument('--max-in-flight', type=int, default=None)
+
+    def handle(self, *args: Any, **options: Any) -> None:  # noqa: WPS110
+        notifications = build_notifications(options['count'])
+        cases: dict[str, Deliver] = {
+            'sequential': send_sequentially,
+            'stream': grpc_client.send_notifications,
+            'concurrent': lambda batch: send_notifications_concurrently(
+                batch, max_in_flight=options['max_in_flight']
+            ),
+        }
+        for name, deliver in cases.items():
+            self.stdout.write(f'{name:<12} {measure(deliver, notifications)}')
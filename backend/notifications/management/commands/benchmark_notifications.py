@@ -0,0 +1,66 @@
+import time
+from collections.abc import Callable
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from events.management.commands.benchmark_event_list import (
+    create_benchmark_data,
+)
+from events.models import Booking, Event
+from notifications.services import (
+    NotificationService,
+    send_fake_notification,
+    send_fake_notifications,
+)
+
+
+def remind_one_by_one(event: Event) -> None:
+    """The event reminder as it was sent before the bulk APIs."""
+    bookings = Booking.objects.filter(event=event).select_related('user')
+    for booking in bookings:
+        notification = NotificationService.create_event_reminder(
+            user=booking.user, event=event
+        )
+        send_fake_notification(notification)
+
+
+def remind_in_bulk(event: Event) -> None:
+    send_fake_notifications(NotificationService.create_event_reminders(event))
+
+
+def measure(remind: Callable[[Event], None], event: Event) -> str:
+    """Reports the number of queries and the time of the reminder."""
+    captured = CaptureQueriesContext(connection)
+    started = time.perf_counter()
+    with captured:
+        remind(event)
+    elapsed = (time.perf_counter() - started) * 1000
+    return f'{len(captured):>8} queries {elapsed:>10.2f} ms'
+
+
+class Command(BaseCommand):
+    """Counts the queries of the event reminder, one by one and in bulk."""
+
+    help = (
+        'Measures the number of queries and the latency of an event '
+        'reminder sent to all the participants one by one and in bulk. '
+        'All the created data is rolled back.'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--participants', type=int, default=5000)
+
+    def handle(self, *args: Any, **options: Any) -> None:  # noqa: WPS110
+        """Creates the benchmark data, measures and rolls it back."""
+        with transaction.atomic():
+            create_benchmark_data(1, options['participants'])
+            event = Event.objects.latest('pk')
+            cases = {
+                'one by one': remind_one_by_one,
+                'bulk': remind_in_bulk,
+            }
+            for name, remind in cases.items():
+                self.stdout.write(f'{name:<12} {measure(remind, event)}')
+            transaction.set_rollback(True)
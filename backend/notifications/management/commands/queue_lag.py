@@ -0,0 +1,48 @@
+import statistics
+from typing import Any
+
+from config import queue_lag
+from config.celery import app
+from django.core.management.base import BaseCommand, CommandParser
+
+
+def describe(queue: str, depth: int, lags: list[float]) -> str:
+    """The depth and the lag percentiles of the queue in one line."""
+    line = f'{queue:<12} {depth:>8} queued {len(lags):>6} samples'
+    if len(lags) > 1:
+        percentiles = statistics.quantiles(lags, n=100)
+        return (
+            '{line} p50 {p50:>9.1f} ms p99 {p99:>9.1f} ms max {max:>9.1f} ms'
+        ).format(
+            line=line, p50=percentiles[49], p99=percentiles[98], max=max(lags)
+        )
+    return line
+
+
+class Command(BaseCommand):
+    """Shows how long the tasks wait in the Celery queues."""
+
+    help = (
+        'Shows the number of the queued tasks of every Celery queue and '
+        'the percentiles of the time its latest tasks waited to start. '
+        'Reset the samples before a load test to measure it alone.'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Drops the recorded lags.',
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:  # noqa: WPS110
+        queues = [queue.name for queue in app.conf.task_queues]
+        if options['reset']:
+            queue_lag.reset_lags(queues)
+        with app.connection_for_read() as connection:
+            channel = connection.default_channel
+            for queue in app.conf.task_queues:
+                depth = queue(channel).queue_declare().message_count
+                self.stdout.write(
+                    describe(queue.name, depth, queue_lag.get_lags(queue.name))
+                )
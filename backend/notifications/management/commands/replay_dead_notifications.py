@@ -0,0 +1,35 @@
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+from notifications.dispatcher import replay_dead_notifications
+
+
+class Command(BaseCommand):
+    """Sends the dead-lettered notifications again."""
+
+    help = (
+        'Sends the dead-lettered notifications through the gRPC client '
+        'again in batches at the controlled rate. The ones failed again '
+        'are dead-lettered back.'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--rate',
+            type=float,
+            default=settings.NOTIFICATIONS_REPLAY_RATE,
+            help='Notifications a second.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.NOTIFICATIONS_REPLAY_BATCH_SIZE,
+        )
+        parser.add_argument('--limit', type=int, default=None)
+
+    def handle(self, *args: Any, **options: Any) -> None:  # noqa: WPS110
+        sent_count, failed_count = replay_dead_notifications(
+            options['batch_size'], options['rate'], options['limit']
+        )
+        self.stdout.write(f'sent: {sent_count}, failed: {failed_count}')
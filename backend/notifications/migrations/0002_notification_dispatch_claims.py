@@ -0,0 +1,39 @@
+# Generated by Django 5.2.1 on 2026-10-18 00:21
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0008_waitlistentry'),
+        ('notifications', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='notification',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Awaiting dispatch'), ('sending', 'Claimed by a dispatcher'), ('sent', 'Shipped'), ('read', 'Readed'), ('failed', 'Sending error')], default='pending', max_length=10),
+        ),
+        migrations.AlterField(
+            model_name='notification',
+            name='type',
+            field=models.CharField(choices=[('event_reminder', 'Event Reminder'), ('booking_confirmation', 'Booking confirmation'), ('event_cancelled', 'The event has been cancelled'), ('event_updated', 'The event has been updated')], default='event_reminder', max_length=32),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('status', 'pending')), fields=['created_at'], name='notifications_pending_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('status', 'sending')), fields=['claimed_at'], name='notifications_sending_idx'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.1 on 2026-10-18 00:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0002_notification_dispatch_claims'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxMessage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('task_name', models.CharField(max_length=255)),
+                ('args', models.JSONField(default=list)),
+            ],
+        ),
+    ]
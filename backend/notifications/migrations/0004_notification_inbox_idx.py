@@ -0,0 +1,20 @@
+# Generated by Django 5.2.1 on 2026-10-18 00:24
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0008_waitlistentry'),
+        ('notifications', '0003_outboxmessage'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['user', 'status', '-created_at', '-id'], name='notifications_inbox_idx'),
+        ),
+    ]
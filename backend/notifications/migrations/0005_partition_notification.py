@@ -0,0 +1,105 @@
+# Converts the notifications table into a table partitioned by month
+# of created_at. The model state doesn't change: Django keeps using `id`
+# as the primary key, the database one is (id, created_at), as
+# a partitioned table requires the partition key in it.
+#
+# The DDL is frozen here rather than imported from notifications.partitions,
+# so later changes of the maintenance never change this migration.
+
+from datetime import UTC, date, datetime, time
+
+from django.db import migrations
+from django.utils import timezone
+
+
+TABLE = 'notifications_notification'
+LEGACY_TABLE = f'{TABLE}_legacy'
+DEFAULT_PARTITION = f'{TABLE}_default'
+# The months after the current one partitioned ahead.
+PARTITIONS_AHEAD = 3
+
+
+def next_month(month):
+    if month.month == 12:
+        return date(month.year + 1, 1, 1)
+    return date(month.year, month.month + 1, 1)
+
+
+def month_of(moment):
+    return moment.astimezone(UTC).date().replace(day=1)
+
+
+def create_partition(cursor, month):
+    bounds = [
+        datetime.combine(month, time.min, tzinfo=UTC),
+        datetime.combine(next_month(month), time.min, tzinfo=UTC),
+    ]
+    cursor.execute(
+        f'CREATE TABLE {TABLE}_{month.strftime("%Y_%m")} '
+        f'PARTITION OF {TABLE} FOR VALUES FROM (%s) TO (%s)',
+        bounds,
+    )
+
+
+def partition_notifications(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        # The definitions reference the table by its name, so they are
+        # replayed on the new table once the legacy one is dropped.
+        cursor.execute(
+            'SELECT indexdef FROM pg_indexes '
+            'WHERE tablename = %s AND indexname <> %s',
+            [TABLE, f'{TABLE}_pkey'],
+        )
+        indexes = [row[0] for row in cursor.fetchall()]
+        cursor.execute(
+            'SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint '
+            "WHERE conrelid = %s::regclass AND contype = 'f'",
+            [TABLE],
+        )
+        foreign_keys = cursor.fetchall()
+        cursor.execute(f'SELECT MIN(created_at) FROM {TABLE}')
+        first_created_at = cursor.fetchone()[0] or timezone.now()
+        cursor.execute(f'ALTER TABLE {TABLE} RENAME TO {LEGACY_TABLE}')
+        cursor.execute(
+            f'CREATE TABLE {TABLE} (LIKE {LEGACY_TABLE} '
+            'INCLUDING DEFAULTS INCLUDING IDENTITY) '
+            'PARTITION BY RANGE (created_at)'
+        )
+        cursor.execute(f'ALTER TABLE {TABLE} ADD PRIMARY KEY (id, created_at)')
+        # Catches the notifications of the months without a partition.
+        cursor.execute(
+            f'CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {TABLE} DEFAULT'
+        )
+        last_month = month_of(timezone.now())
+        for _ in range(PARTITIONS_AHEAD):
+            last_month = next_month(last_month)
+        month = month_of(first_created_at)
+        while month <= last_month:
+            create_partition(cursor, month)
+            month = next_month(month)
+        cursor.execute(f'INSERT INTO {TABLE} SELECT * FROM {LEGACY_TABLE}')
+        cursor.execute(
+            f"SELECT setval(pg_get_serial_sequence('{TABLE}', 'id'), "
+            f'COALESCE(MAX(id), 0) + 1, false) FROM {TABLE}'
+        )
+        cursor.execute(f'DROP TABLE {LEGACY_TABLE}')
+        for index in indexes:
+            cursor.execute(index)
+        for name, definition in foreign_keys:
+            cursor.execute(
+                f'ALTER TABLE {TABLE} ADD CONSTRAINT {name} {definition}'
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0004_notification_inbox_idx'),
+    ]
+
+    # Irreversible: the partitioned table is not converted back.
+    operations = [
+        migrations.RunPython(partition_notifications),
+    ]
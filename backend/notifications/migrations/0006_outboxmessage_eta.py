@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 00:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0005_partition_notification'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboxmessage',
+            name='eta',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
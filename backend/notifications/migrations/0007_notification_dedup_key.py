@@ -0,0 +1,25 @@
+# Generated by Django 5.2.1 on 2026-10-18 00:35
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0009_event_reminded_at'),
+        ('notifications', '0006_outboxmessage_eta'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='dedup_key',
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('dedup_key__isnull', False)), fields=['dedup_key', 'user'], name='notifications_dedup_idx'),
+        ),
+    ]
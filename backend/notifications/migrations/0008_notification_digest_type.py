@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 00:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0007_notification_dedup_key'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='notification',
+            name='type',
+            field=models.CharField(choices=[('event_reminder', 'Event Reminder'), ('booking_confirmation', 'Booking confirmation'), ('event_cancelled', 'The event has been cancelled'), ('event_updated', 'The event has been updated'), ('digest', 'Several notifications in one')], default='event_reminder', max_length=32),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.1 on 2026-10-18 00:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0009_event_reminded_at'),
+        ('notifications', '0008_notification_digest_type'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationAttempt',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('notification_id', models.BigIntegerField(db_index=True)),
+                ('attempt', models.PositiveSmallIntegerField()),
+                ('status_code', models.CharField(max_length=32)),
+                ('latency_ms', models.PositiveIntegerField()),
+                ('error', models.CharField(blank=True, max_length=255)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='failed_attempts',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='next_attempt_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='notification',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Awaiting dispatch'), ('sending', 'Claimed by a dispatcher'), ('sent', 'Shipped'), ('read', 'Readed'), ('failed', 'Sending error'), ('dead', 'Dead-lettered after the last attempt')], default='pending', max_length=10),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('status__in', ['dead', 'failed'])), fields=['id'], name='notifications_dead_idx'),
+        ),
+    ]
@@ -8,19 +8,37 @@ class NotificationType(models.TextChoices):
     BOOKING_CONFIRMATION = 'booking_confirmation', 'Booking confirmation'
     EVENT_CANCELLED = 'event_cancelled', 'The event has been cancelled'
     EVENT_UPDATED = 'event_updated', 'The event has been updated'
+    DIGEST = 'digest', 'Several notifications in one'
 
 
 class NotificationStatus(models.TextChoices):
     PENDING = 'pending', 'Awaiting dispatch'
+    SENDING = 'sending', 'Claimed by a dispatcher'
     SENT = 'sent', 'Shipped'
     READ = 'read', 'Readed'
     FAILED = 'failed', 'Sending error'
+    DEAD = 'dead', 'Dead-lettered after the last attempt'
 
 
 class Notification(models.Model):
+    """
+    A notification to the user.
+
+    The table is partitioned by month of `created_at` (see partitions.py),
+    its primary key in the database is (id, created_at).
+    """
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     sent_at = models.DateTimeField(null=True, blank=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    # The failed deliveries are retried with a backoff until
+    # NOTIFICATIONS_MAX_ATTEMPTS, then the notification is dead-lettered.
+    failed_attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(null=True, blank=True)
+    # The notifications of one fan-out share the key, every user gets
+    # one of them however many times the chunk is processed.
+    dedup_key = models.CharField(max_length=255, null=True, blank=True)
     user = models.ForeignKey(
         User, on_delete=models.CASCADE, related_name='notifications'
     )
@@ -44,7 +62,86 @@ class Notification(models.Model):
         related_name='notifications',
     )
 
+    class Meta:
+        indexes = (
+            # The dispatcher claims the oldest pending notifications.
+            models.Index(
+                fields=['created_at'],
+                condition=models.Q(status=NotificationStatus.PENDING),
+                name='notifications_pending_idx',
+            ),
+            models.Index(
+                fields=['claimed_at'],
+                condition=models.Q(status=NotificationStatus.SENDING),
+                name='notifications_sending_idx',
+            ),
+            # The inbox of a user, newest first.
+            models.Index(
+                fields=['user', 'status', '-created_at', '-id'],
+                name='notifications_inbox_idx',
+            ),
+            models.Index(
+                fields=['id'],
+                condition=models.Q(
+                    status__in=[
+                        NotificationStatus.DEAD,
+                        NotificationStatus.FAILED,
+                    ]
+                ),
+                name='notifications_dead_idx',
+            ),
+            models.Index(
+                fields=['dedup_key', 'user'],
+                condition=models.Q(dedup_key__isnull=False),
+                name='notifications_dedup_idx',
+            ),
+        )
+
     def __str__(self) -> str:
         return 'Notification to {user}: {title}'.format(
             user=self.user.username, title=self.title
         )
+
+
+class NotificationAttempt(models.Model):
+    """
+    A delivery attempt of a notification.
+
+    The notification is referenced without a foreign key: the primary key
+    of the partitioned notifications table is (id, created_at).
+    """
+
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    notification_id = models.BigIntegerField(db_index=True)
+    attempt = models.PositiveSmallIntegerField()
+    # The name of the gRPC status code of the call, OK if it succeeded.
+    status_code = models.CharField(max_length=32)
+    latency_ms = models.PositiveIntegerField()
+    error = models.CharField(max_length=255, blank=True)
+
+    def __str__(self) -> str:
+        return 'Attempt {attempt} of {notification_id}: {status_code}'.format(
+            attempt=self.attempt,
+            notification_id=self.notification_id,
+            status_code=self.status_code,
+        )
+
+
+class OutboxMessage(models.Model):
+    """
+    A celery task written in the transaction of the change that causes it.
+
+    The relay publishes the committed messages to the broker and deletes
+    them, so the task never runs before the change is visible and
+    is not lost if the broker is unavailable.
+    """
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    task_name = models.CharField(max_length=255)
+    args = models.JSONField(default=list)
+    eta = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self) -> str:
+        return '{task_name}{args}'.format(
+            task_name=self.task_name, args=tuple(self.args)
+        )
@@ -0,0 +1,51 @@
+import logging
+from datetime import datetime
+from typing import Any
+
+from celery import Task, current_app
+from django.db import transaction
+
+from notifications.models import OutboxMessage
+
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue(
+    task: Task, *args: Any, eta: datetime | None = None
+) -> OutboxMessage:
+    """
+    Schedules the task with the JSON serializable arguments
+    (to run not earlier than `eta` if it is given).
+
+    It is called in the transaction of the change, the task is published
+    by the relay after the commit and is dropped with a rollback.
+    """
+    return OutboxMessage.objects.create(
+        task_name=task.name, args=list(args), eta=eta
+    )
+
+
+def relay(batch_size: int) -> int:
+    """
+    Publishes a batch of the oldest messages and deletes them.
+
+    The rows locked by the other relays are skipped. A message is
+    published at least once: if the broker fails, the unpublished rest
+    of the batch waits for the next relay.
+    """
+    published_ids: list[int] = []
+    with transaction.atomic():
+        messages = OutboxMessage.objects.order_by('pk').select_for_update(
+            skip_locked=True
+        )[:batch_size]
+        try:
+            for message in messages:
+                current_app.send_task(
+                    message.task_name, args=message.args, eta=message.eta
+                )
+                published_ids.append(message.pk)
+        except Exception:
+            logger.exception('Unable to publish the outbox messages')
+        OutboxMessage.objects.filter(pk__in=published_ids).delete()
+    return len(published_ids)
@@ -0,0 +1,158 @@
+import logging
+import re
+from datetime import UTC, date, datetime, time
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.backends.utils import CursorWrapper
+from django.utils import timezone
+
+
+logger = logging.getLogger(__name__)
+
+NOTIFICATION_TABLE = 'notifications_notification'
+# Catches the notifications of the months without a partition (if the
+# maintenance stops), they are moved once the partition is created.
+DEFAULT_PARTITION = f'{NOTIFICATION_TABLE}_default'
+FALLEN_SINCE = f'SELECT MIN(created_at) FROM {DEFAULT_PARTITION}'  # noqa: S608
+MOVE_FROM_DEFAULT = (
+    f'WITH moved AS (DELETE FROM {DEFAULT_PARTITION} '  # noqa: S608
+    'WHERE created_at >= %s AND created_at < %s RETURNING *) '
+    'INSERT INTO {partition} SELECT * FROM moved'
+)
+PARTITION_NAME = re.compile(rf'^{NOTIFICATION_TABLE}_(\d{{4}}_\d{{2}})$')
+PARTITION_MONTH_FORMAT = '%Y_%m'
+MONTHS_IN_YEAR = 12
+
+
+def add_months(month: date, months: int) -> date:
+    """The first day of the month shifted by the number of months."""
+    month_index = month.year * MONTHS_IN_YEAR + month.month - 1 + months
+    return date(
+        month_index // MONTHS_IN_YEAR, month_index % MONTHS_IN_YEAR + 1, 1
+    )
+
+
+def month_of(moment: date | datetime) -> date:
+    """The first day of the (UTC) month of the moment."""
+    if isinstance(moment, datetime):
+        moment = moment.astimezone(UTC).date()
+    return moment.replace(day=1)
+
+
+def partition_name(month: date) -> str:
+    return f'{NOTIFICATION_TABLE}_{month.strftime(PARTITION_MONTH_FORMAT)}'
+
+
+def create_partitions(first_month: date, last_month: date) -> list[str]:
+    """
+    Creates the missing monthly partitions of the notifications between
+    the months (inclusive) and the ones of the notifications fallen into
+    the default partition, returns the names of the created ones.
+    """
+    created = []
+    existing = set(get_partitions())
+    month = month_of(first_month)
+    with connection.cursor() as cursor:
+        cursor.execute(FALLEN_SINCE)
+        fallen_since = cursor.fetchone()[0]
+        if fallen_since is not None:
+            logger.warning(
+                'Notifications without a partition since %s', fallen_since
+            )
+            month = min(month, month_of(fallen_since))
+        while month <= last_month:
+            if month not in existing:
+                _attach_partition(cursor, month)
+                created.append(partition_name(month))
+            month = add_months(month, 1)
+    return created
+
+
+def drop_partitions(before_month: date) -> list[str]:
+    """
+    Detaches and drops the partitions of the months before the given one,
+    returns the names of the dropped ones.
+
+    Dropping a partition is a cheap metadata change, unlike a DELETE
+    of its rows that leaves the table and indexes bloated.
+    """
+    dropped = []
+    with connection.cursor() as cursor:
+        for month in get_partitions():
+            if month < before_month:
+                partition = partition_name(month)
+                cursor.execute(
+                    f'ALTER TABLE {NOTIFICATION_TABLE} '
+                    f'DETACH PARTITION {partition}'
+                )
+                cursor.execute(f'DROP TABLE {partition}')
+                dropped.append(partition)
+    return dropped
+
+
+def get_partitions() -> list[date]:
+    """Months of the existing partitions of the notifications, sorted."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT child.relname FROM pg_inherits '
+            'JOIN pg_class child ON child.oid = pg_inherits.inhrelid '
+            'WHERE pg_inherits.inhparent = %s::regclass',
+            [NOTIFICATION_TABLE],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    return sorted(
+        datetime.strptime(match.group(1), PARTITION_MONTH_FORMAT)
+        .replace(tzinfo=UTC)
+        .date()
+        for match in map(PARTITION_NAME.match, names)
+        if match
+    )
+
+
+def _attach_partition(cursor: CursorWrapper, month: date) -> None:
+    """
+    Creates the partition of the month with its notifications moved from
+    the default partition. The partition is filled before it is attached,
+    as a partition overlapping the rows of the default one can't be added.
+    """
+    partition = partition_name(month)
+    bounds = (
+        datetime.combine(month, time.min, tzinfo=UTC),
+        datetime.combine(add_months(month, 1), time.min, tzinfo=UTC),
+    )
+    cursor.execute(
+        f'CREATE TABLE {partition} (LIKE {NOTIFICATION_TABLE} '
+        'INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'
+    )
+    cursor.execute(MOVE_FROM_DEFAULT.format(partition=partition), bounds)
+    # The indexes and the foreign keys of the table are created
+    # on the partition when it is attached.
+    cursor.execute(
+        f'ALTER TABLE {NOTIFICATION_TABLE} ATTACH PARTITION {partition} '
+        'FOR VALUES FROM (%s) TO (%s)',
+        bounds,
+    )
+
+
+def maintain_partitions() -> tuple[list[str], list[str]]:
+    """
+    Creates the partitions of NOTIFICATIONS_PARTITIONS_AHEAD next months
+    and drops the ones older than NOTIFICATIONS_RETENTION_MONTHS.
+    Returns the names of the created and dropped partitions.
+    """
+    if connection.vendor != 'postgresql':
+        return [], []
+    current_month = month_of(timezone.now())
+    with transaction.atomic():
+        created = create_partitions(
+            current_month,
+            add_months(current_month, settings.NOTIFICATIONS_PARTITIONS_AHEAD),
+        )
+        dropped = drop_partitions(
+            add_months(current_month, -settings.NOTIFICATIONS_RETENTION_MONTHS)
+        )
+    logger.info(
+        'Notification partitions created: %s, dropped: %s', created, dropped
+    )
+    return created, dropped
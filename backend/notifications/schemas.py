@@ -0,0 +1,35 @@
+from ninja import ModelSchema, Schema
+
+from notifications.models import Notification
+
+
+class NotificationOut(ModelSchema):
+    class Meta:
+        model = Notification
+        fields = (
+            'id',
+            'created_at',
+            'sent_at',
+            'type',
+            'status',
+            'title',
+            'message',
+            'related_event',
+        )
+
+
+class NotificationFilterIn(Schema):
+    unread: bool = False
+
+
+class MarkReadIn(Schema):
+    ids: list[int] | None = None
+
+
+class MarkReadOut(Schema):
+    marked: int
+    unread: int
+
+
+class UnreadCountOut(Schema):
+    unread: int
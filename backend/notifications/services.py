@@ -1,14 +1,21 @@
 import logging
+from collections import Counter
+from datetime import datetime, timedelta
 from typing import Any
 
+from django.conf import settings
 from django.contrib.auth.models import User
-from django.db.models import QuerySet
+from django.db import transaction
+from django.db.models import Q, QuerySet  # noqa: WPS347
 from django.utils import timezone
 from events.models import Booking, Event
 
-from notifications.grpc.client import grpc_client
+from notifications import digest, fanout, unread
+from notifications.grpc.aio import send_notifications_concurrently
+from notifications.grpc.client import Delivery, grpc_client
 from notifications.models import (
     Notification,
+    NotificationAttempt,
     NotificationStatus,
     NotificationType,
 )
@@ -16,6 +23,19 @@ from notifications.models import (
 
 logger = logging.getLogger(__name__)
 
+BULK_BATCH_SIZE = 1000
+INBOX_STATUSES = (NotificationStatus.SENT, NotificationStatus.READ)
+DEAD_STATUSES = (NotificationStatus.DEAD, NotificationStatus.FAILED)
+ERROR_MAX_LENGTH = 255
+BOOKING_CONFIRMATION_KEY = 'booking_confirmation:{booking_id}'
+# The attempt of the notification whose claim expired before it finished.
+CLAIM_EXPIRED = Delivery(
+    success=False,
+    status_code='DEADLINE_EXCEEDED',
+    latency_ms=settings.NOTIFICATIONS_CLAIM_TIMEOUT * 1000,
+    error='The claim expired before the delivery finished',
+)
+
 
 class NotificationService:  # noqa: WPS214
     @staticmethod
@@ -35,6 +55,36 @@ class NotificationService:  # noqa: WPS214
             related_event=related_event,
         )
 
+    @staticmethod
+    def notify_user(user_id: int, draft: digest.Draft) -> Notification | None:
+        """
+        Creates the notification of the user or, if its type is coalesced,
+        buffers it into the digest of the user and returns None.
+        """
+        if digest.coalesce(user_id, draft):
+            return None
+        return NotificationService._create_from_draft(user_id, draft)
+
+    @staticmethod
+    def create_digest(
+        user_id: int, drafts: list[digest.Draft], dedup_key: str
+    ) -> Notification | None:
+        """
+        One notification of all the notifications buffered for the user,
+        claimed for sending. Returns None if the digest with the dedup key
+        has been created already.
+        """
+        if Notification.objects.filter(
+            user_id=user_id, dedup_key=dedup_key
+        ).exists():
+            return None
+        return NotificationService._create_from_draft(
+            user_id,
+            digest.merge(drafts),
+            status=NotificationStatus.SENDING,
+            dedup_key=dedup_key,
+        )
+
     @staticmethod
     def mark_as_sent(notification_id: int) -> Notification | None:
         try:
@@ -42,6 +92,8 @@ class NotificationService:  # noqa: WPS214
         except Notification.DoesNotExist:
             return None
         else:
+            if notification.status != NotificationStatus.SENT:
+                unread.add_unread(Counter({notification.user_id: 1}))
             notification.status = NotificationStatus.SENT
             notification.sent_at = timezone.now()
             notification.save(update_fields=['status', 'sent_at', 'updated_at'])
@@ -54,35 +106,199 @@ class NotificationService:  # noqa: WPS214
         except Notification.DoesNotExist:
             return None
         else:
+            if notification.status == NotificationStatus.SENT:
+                unread.add_unread(Counter({notification.user_id: -1}))
             notification.status = NotificationStatus.READ
             notification.save(update_fields=['status', 'updated_at'])
             return notification
 
     @staticmethod
-    def mark_as_failed(
-        notification_id: int,
-        error_message: str | None = None,
-    ) -> Notification | None:
-        try:
-            notification = Notification.objects.get(id=notification_id)
+    def mark_as_failed(notification_id: int) -> Notification | None:
+        """Schedules the retry of the notification (see mark_many_as_failed)."""
+        NotificationService.mark_many_as_failed([notification_id])
+        return Notification.objects.filter(id=notification_id).first()
 
-        except Notification.DoesNotExist:
-            return None
-        else:
-            notification.status = NotificationStatus.FAILED
-            if error_message:
-                notification.message += f'\n\nError: {error_message}'  # noqa: WPS336
-            notification.save(update_fields=['status', 'message', 'updated_at'])
-            return notification
+    @staticmethod
+    def mark_many_as_sent(
+        notification_ids: list[int],
+        from_status: NotificationStatus | None = None,
+    ) -> int:
+        """
+        Marks the notifications as sent with one UPDATE, only the ones
+        in `from_status` if it is given.
+
+        The rows are locked first to count the new unread notifications
+        of every user exactly.
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            marked = list(
+                NotificationService._filter_by_status(
+                    notification_ids, from_status
+                )
+                .exclude(status=NotificationStatus.SENT)
+                .select_for_update()
+                .values_list('id', 'user_id')
+            )
+            unread.add_unread(Counter(user_id for _, user_id in marked))
+            return Notification.objects.filter(
+                id__in=[marked_id for marked_id, _ in marked]
+            ).update(
+                status=NotificationStatus.SENT, sent_at=now, updated_at=now
+            )
+
+    @staticmethod
+    def mark_many_as_read(
+        user_id: int, notification_ids: list[int] | None = None
+    ) -> int:
+        """
+        Marks the sent notifications of the user (all of them by default)
+        as read with one UPDATE.
+        """
+        notifications = Notification.objects.filter(
+            user_id=user_id, status=NotificationStatus.SENT
+        )
+        if notification_ids is not None:
+            notifications = notifications.filter(id__in=notification_ids)
+        with transaction.atomic():
+            marked_count = notifications.update(
+                status=NotificationStatus.READ, updated_at=timezone.now()
+            )
+            unread.add_unread(Counter({user_id: -marked_count}))
+        return marked_count
+
+    @staticmethod
+    def mark_many_as_failed(
+        notification_ids: list[int],
+        from_status: NotificationStatus | None = None,
+    ) -> int:
+        """
+        Schedules the retries of the failed notifications after the
+        exponential backoff, the ones failed NOTIFICATIONS_MAX_ATTEMPTS
+        times are dead-lettered. Only the ones in `from_status` are marked
+        if it is given.
+
+        The notifications with the same number of the failed attempts
+        are updated together, with one UPDATE per number.
+        """
+        now = timezone.now()
+        notifications = NotificationService._filter_by_status(
+            notification_ids, from_status
+        )
+        return sum(
+            NotificationService._schedule_retry(
+                notifications.filter(failed_attempts=failed_attempts),
+                failed_attempts + 1,
+                now,
+            )
+            for failed_attempts in set(
+                notifications.values_list('failed_attempts', flat=True)
+            )
+        )
+
+    @staticmethod
+    def log_attempts(deliveries: dict[int, Delivery]) -> None:
+        """
+        Logs the delivery attempts of the notifications (by their ids),
+        before their statuses are updated.
+        """
+        failed_attempts = dict(
+            Notification.objects.filter(id__in=deliveries).values_list(
+                'id', 'failed_attempts'
+            )
+        )
+        NotificationAttempt.objects.bulk_create(
+            (
+                NotificationAttempt(
+                    notification_id=notification_id,
+                    attempt=failed_attempts.get(notification_id, 0) + 1,
+                    status_code=delivery.status_code,
+                    latency_ms=round(delivery.latency_ms),
+                    error=delivery.error[:ERROR_MAX_LENGTH],
+                )
+                for notification_id, delivery in deliveries.items()
+            ),
+            batch_size=BULK_BATCH_SIZE,
+        )
+
+    @staticmethod
+    def delete_attempts(before: datetime) -> int:
+        deleted_count, _ = NotificationAttempt.objects.filter(
+            created_at__lt=before
+        ).delete()
+        return deleted_count
+
+    @staticmethod
+    def claim_pending_notifications(limit: int) -> list[Notification]:
+        """
+        Claims the oldest pending notifications (due to be retried)
+        for sending.
+
+        The rows locked by the other dispatchers are skipped, so parallel
+        dispatchers claim disjoint chunks. The claimed notifications are
+        SENDING until they are finished or the claim expires.
+        """
+        return NotificationService._claim(
+            Notification.objects.filter(
+                Q(next_attempt_at__isnull=True)
+                | Q(next_attempt_at__lte=timezone.now()),
+                status=NotificationStatus.PENDING,
+            ).order_by('created_at'),
+            limit,
+        )
+
+    @staticmethod
+    def claim_dead_notifications(
+        limit: int, after_id: int = 0
+    ) -> list[Notification]:
+        """
+        Claims the dead-lettered (and the failed before the retries)
+        notifications after the id for the replay.
+        """
+        return NotificationService._claim(
+            Notification.objects.filter(
+                id__gt=after_id, status__in=DEAD_STATUSES
+            ).order_by('id'),
+            limit,
+        )
+
+    @staticmethod
+    def release_expired_claims() -> int:
+        """
+        Fails the notifications of the crashed or hung dispatchers: they are
+        logged as failed attempts and retried after the backoff like any
+        failed delivery, so a notification that never finishes its
+        sending is dead-lettered after NOTIFICATIONS_MAX_ATTEMPTS.
+        """
+        expired = Notification.objects.filter(
+            status=NotificationStatus.SENDING,
+            claimed_at__lt=timezone.now()
+            - timedelta(seconds=settings.NOTIFICATIONS_CLAIM_TIMEOUT),
+        )
+        with transaction.atomic():
+            expired_ids = list(
+                expired.select_for_update(skip_locked=True).values_list(
+                    'pk', flat=True
+                )
+            )
+            NotificationService.log_attempts(
+                dict.fromkeys(expired_ids, CLAIM_EXPIRED)
+            )
+            return NotificationService.mark_many_as_failed(
+                expired_ids, from_status=NotificationStatus.SENDING
+            )
 
     @staticmethod
     def get_user_notifications(
         user_id: int, status: NotificationStatus | None = None
     ) -> QuerySet[Notification]:
-        query = Notification.objects.filter(user_id=user_id)
+        """The inbox of the user: the delivered notifications, newest first."""
+        query = Notification.objects.filter(
+            user_id=user_id, status__in=INBOX_STATUSES
+        )
         if status:
             query = query.filter(status=status)
-        return query.order_by('-created_at')
+        return query.order_by('-created_at', '-pk')
 
     @staticmethod
     def get_pending_notifications() -> QuerySet[Notification]:
@@ -106,39 +322,117 @@ class NotificationService:  # noqa: WPS214
             related_event=event,
         )
 
+    @staticmethod
+    def get_event_reminder(event: Event) -> fanout.FanOut:
+        """
+        The reminder of all the participants, sent once for every start
+        time of the event.
+        """
+        return fanout.FanOut(
+            event_id=event.pk,
+            notification_type=NotificationType.EVENT_REMINDER,
+            title=f'Reminder: {event.title}',
+            message=f"The event will start in an hour '{event.title}'",
+            dedup_key='event_reminder:{event_id}:{start_time}'.format(
+                event_id=event.pk, start_time=event.start_time.isoformat()
+            ),
+        )
+
+    @staticmethod
+    def get_event_cancellation(event: Event) -> fanout.FanOut:
+        """The cancellation of the event, sent once to all the participants."""
+        return fanout.FanOut(
+            event_id=event.pk,
+            notification_type=NotificationType.EVENT_CANCELLED,
+            title=f'The event has been cancelled: {event.title}',
+            message=f"Unfortunately, '{event.title}' has been cancelled.",
+            dedup_key=f'event_cancelled:{event.pk}',
+        )
+
+    @staticmethod
+    def create_event_reminders(event: Event) -> list[Notification]:
+        """Reminds all the participants of the event in bulk."""
+        return NotificationService.notify_all_participants(
+            NotificationService.get_event_reminder(event)
+        )
+
     @staticmethod
     def create_booking_confirmation(
-        user: User, event: Event, seats: int
-    ) -> Notification:
-        title = f'Booking confirmed: {event.title}'
-        message = f"You have successfully booked {seats} for '{event.title}'"
-        return NotificationService.create_notification(
-            user=user,
-            title=title,
-            message=message,
-            notification_type=NotificationType.BOOKING_CONFIRMATION,
-            related_event=event,
+        booking_id: int,
+        status: NotificationStatus = NotificationStatus.PENDING,
+    ) -> Notification | None:
+        """
+        The notification created SENDING is claimed by the caller,
+        the dispatcher doesn't send it until the claim expires. Returns
+        None if the booking is deleted or confirmed already.
+        """
+        confirmations = NotificationService.create_booking_confirmations(
+            [booking_id], status
         )
+        return confirmations[0] if confirmations else None
+
+    @staticmethod
+    def create_booking_confirmations(
+        booking_ids: list[int],
+        status: NotificationStatus = NotificationStatus.PENDING,
+    ) -> list[Notification]:
+        """
+        Confirms the bookings in bulk, every one of them once.
+
+        The tasks are published by the at-least-once outbox, so a booking
+        confirmed already by a redelivered task is skipped. The bookings
+        are locked, a batch confirmed twice at once waits and creates
+        nothing.
+        """
+        claimed_at = NotificationService._get_claimed_at(status)
+        with transaction.atomic():
+            bookings = list(
+                Booking.objects.filter(pk__in=booking_ids)
+                .select_related('event')
+                .select_for_update(of=('self',))
+                .order_by('pk')
+            )
+            confirmed = set(
+                Notification.objects.filter(
+                    dedup_key__in=[
+                        BOOKING_CONFIRMATION_KEY.format(booking_id=booking.pk)
+                        for booking in bookings
+                    ],
+                    user_id__in={booking.user_id for booking in bookings},
+                ).values_list('dedup_key', flat=True)
+            )
+            return Notification.objects.bulk_create(
+                (
+                    NotificationService._build_booking_confirmation(
+                        booking, status, claimed_at
+                    )
+                    for booking in bookings
+                    if BOOKING_CONFIRMATION_KEY.format(booking_id=booking.pk)
+                    not in confirmed
+                ),
+                batch_size=BULK_BATCH_SIZE,
+            )
 
     @staticmethod
     def create_event_cancelled_notification(
         user: User, event: Event
-    ) -> Notification:
-        title = f'The event has been cancelled: {event.title}'
-        message = f"Unfortunately, '{event.title}' has been cancelled."
-
-        return NotificationService.create_notification(
-            user=user,
-            title=title,
-            message=message,
-            notification_type=NotificationType.EVENT_CANCELLED,
-            related_event=event,
+    ) -> Notification | None:
+        """The notification is coalesced into the digest if it is enabled."""
+        return NotificationService.notify_user(
+            user.pk,
+            digest.Draft(
+                notification_type=NotificationType.EVENT_CANCELLED,
+                title=f'The event has been cancelled: {event.title}',
+                message=f"Unfortunately, '{event.title}' has been cancelled.",
+                related_event_id=event.pk,
+            ),
         )
 
     @staticmethod
     def create_event_updated_notification(
         user: User, event: Event, changes: dict[str, Any] | None = None
-    ) -> Notification:
+    ) -> Notification | None:
+        """The notification is coalesced into the digest if it is enabled."""
         title = f'The event has been updated: {event.title}'
         message = f"Information about '{event.title}' has been updated."
         if changes:
@@ -146,34 +440,140 @@ class NotificationService:  # noqa: WPS214
             for field, new_value in changes.items():  # noqa: WPS519
                 message += f'\n- {field}: {new_value}'  # noqa: WPS336
 
-        return NotificationService.create_notification(
-            user=user,
-            title=title,
-            message=message,
-            notification_type=NotificationType.EVENT_UPDATED,
-            related_event=event,
+        return NotificationService.notify_user(
+            user.pk,
+            digest.Draft(
+                notification_type=NotificationType.EVENT_UPDATED,
+                title=title,
+                message=message,
+                related_event_id=event.pk,
+            ),
         )
 
     @staticmethod
     def notify_all_participants(
-        event: Event,
-        notification_type: NotificationType,
-        title: str,
-        message: str,
+        fan_out: fanout.FanOut, chunk_size: int = BULK_BATCH_SIZE
     ) -> list[Notification]:
-        bookings = Booking.objects.filter(event=event).select_related('user')
-        notifications = []
-        for booking in bookings:
-            notification = NotificationService.create_notification(
-                user=booking.user,
-                title=title,
-                message=message,
-                notification_type=notification_type,
-                related_event=event,
+        """
+        Notifies all the participants of the event in bulk, chunk by chunk
+        of the bookings. The participants already notified with the dedup
+        key of the fan-out are skipped.
+        """
+        return [
+            notification
+            for after_pk, last_pk in fanout.get_chunks(
+                fan_out.event_id, chunk_size
             )
-            notifications.append(notification)
+            for notification in fanout.create_chunk(fan_out, after_pk, last_pk)
+        ]
+
+    @staticmethod
+    def fan_out_to_participants(fan_out: fanout.FanOut) -> int:
+        """
+        Notifies all the participants of the event by the parallel tasks
+        of NOTIFICATIONS_FAN_OUT_CHUNK_SIZE participants each.
+        Returns the number of the tasks.
+        """
+        return fanout.start_fan_out(
+            fan_out, settings.NOTIFICATIONS_FAN_OUT_CHUNK_SIZE
+        )
+
+    @staticmethod
+    def _filter_by_status(
+        notification_ids: list[int], status: NotificationStatus | None
+    ) -> QuerySet[Notification]:
+        notifications = Notification.objects.filter(id__in=notification_ids)
+        if status:
+            notifications = notifications.filter(status=status)
         return notifications
 
+    @staticmethod
+    def _claim(
+        notifications: QuerySet[Notification], limit: int
+    ) -> list[Notification]:
+        with transaction.atomic():
+            claimed = list(
+                notifications.select_for_update(skip_locked=True)[:limit]
+            )
+            now = timezone.now()
+            Notification.objects.filter(
+                id__in=[notification.pk for notification in claimed]
+            ).update(
+                status=NotificationStatus.SENDING,
+                claimed_at=now,
+                updated_at=now,
+            )
+        return claimed
+
+    @staticmethod
+    def _schedule_retry(
+        notifications: QuerySet[Notification],
+        failed_attempts: int,
+        now: datetime,
+    ) -> int:
+        status = NotificationStatus.DEAD
+        next_attempt_at = None
+        if failed_attempts < settings.NOTIFICATIONS_MAX_ATTEMPTS:
+            status = NotificationStatus.PENDING
+            next_attempt_at = now + timedelta(
+                seconds=min(
+                    settings.NOTIFICATIONS_RETRY_BACKOFF
+                    * 2 ** (failed_attempts - 1),
+                    settings.NOTIFICATIONS_RETRY_BACKOFF_MAX,
+                )
+            )
+        return notifications.update(
+            failed_attempts=failed_attempts,
+            status=status,
+            next_attempt_at=next_attempt_at,
+            updated_at=now,
+        )
+
+    @staticmethod
+    def _get_claimed_at(status: NotificationStatus) -> datetime | None:
+        if status == NotificationStatus.SENDING:
+            return timezone.now()
+        return None
+
+    @staticmethod
+    def _build_booking_confirmation(
+        booking: Booking,
+        status: NotificationStatus,
+        claimed_at: datetime | None,
+    ) -> Notification:
+        return Notification(
+            user_id=booking.user_id,
+            type=NotificationType.BOOKING_CONFIRMATION,
+            status=status,
+            claimed_at=claimed_at,
+            title='Booking confirmed: {title}'.format(
+                title=booking.event.title
+            ),
+            message="You have successfully booked {seats} for '{title}'".format(
+                seats=booking.seats, title=booking.event.title
+            ),
+            related_event_id=booking.event_id,
+            dedup_key=BOOKING_CONFIRMATION_KEY.format(booking_id=booking.pk),
+        )
+
+    @staticmethod
+    def _create_from_draft(
+        user_id: int,
+        draft: digest.Draft,
+        status: NotificationStatus = NotificationStatus.PENDING,
+        dedup_key: str | None = None,
+    ) -> Notification:
+        return Notification.objects.create(
+            user_id=user_id,
+            type=draft.notification_type,
+            status=status,
+            claimed_at=NotificationService._get_claimed_at(status),
+            dedup_key=dedup_key,
+            title=draft.title,
+            message=draft.message,
+            related_event_id=draft.related_event_id,
+        )
+
 
 def send_fake_notification(notification: Notification) -> bool:
     logger.debug(
@@ -186,27 +586,92 @@ def send_fake_notification(notification: Notification) -> bool:
         NotificationService.mark_as_sent(notification.id)
     except Exception as error:
         logger.debug('Error sending notification: %s', error)
-        NotificationService.mark_as_failed(notification.id, str(error))
+        NotificationService.mark_as_failed(notification.id)
         return False
     else:
         return True
 
 
-def send_grpc_notification(notification: Notification) -> bool:
-    try:
-        is_send = grpc_client.send_notification(
-            notification_id=notification.pk,
-            user_id=notification.user.pk,
-            notification_type=notification.type,
-            title=notification.title,
-            message=notification.message,
+def send_fake_notifications(notifications: list[Notification]) -> bool:
+    """Bulk version of send_fake_notification with the set-based UPDATEs."""
+    for notification in notifications:
+        logger.debug(
+            'NOTIFICATION TO %s: %s',
+            notification.user_id,
+            notification.title,
         )
+    notification_ids = [sent.id for sent in notifications]
+    try:
+        NotificationService.mark_many_as_sent(notification_ids)
     except Exception as error:
-        NotificationService.mark_as_failed(notification.id, str(error))
+        logger.debug('Error sending notifications: %s', error)
+        NotificationService.mark_many_as_failed(notification_ids)
         return False
     else:
-        if is_send:
-            NotificationService.mark_as_sent(notification.id)
-            return True
-        NotificationService.mark_as_failed(notification.id)
-        return False
+        return True
+
+
+def send_grpc_notification(
+    notification: Notification,
+    from_status: NotificationStatus | None = None,
+) -> bool:
+    delivery = grpc_client.send_notification(
+        notification_id=notification.pk,
+        user_id=notification.user_id,
+        notification_type=notification.type,
+        title=notification.title,
+        message=notification.message,
+    )
+    return bool(_update_statuses({notification.pk: delivery}, from_status))
+
+
+def send_grpc_notifications(
+    notifications: list[Notification],
+    from_status: NotificationStatus | None = None,
+) -> int:
+    """
+    Bulk version of send_grpc_notification: the notifications are streamed
+    in one call. Returns the number of the sent notifications.
+    """
+    return _update_statuses(
+        grpc_client.send_notifications(notifications), from_status
+    )
+
+
+def send_grpc_notifications_concurrently(
+    notifications: list[Notification],
+    from_status: NotificationStatus | None = None,
+) -> int:
+    """
+    Sends the notifications with concurrent calls having their own
+    deadlines. Returns the number of the sent notifications.
+    """
+    return _update_statuses(
+        send_notifications_concurrently(notifications), from_status
+    )
+
+
+def _update_statuses(
+    deliveries: dict[int, Delivery],
+    from_status: NotificationStatus | None = None,
+) -> int:
+    """
+    Logs the delivery attempts and updates the statuses of the delivered
+    and failed notifications with the set-based queries.
+    """
+    NotificationService.log_attempts(deliveries)
+    sent_ids = [
+        notification_id
+        for notification_id, delivery in deliveries.items()
+        if delivery.success
+    ]
+    NotificationService.mark_many_as_sent(sent_ids, from_status)
+    NotificationService.mark_many_as_failed(
+        [
+            notification_id
+            for notification_id, delivery in deliveries.items()
+            if not delivery.success
+        ],
+        from_status=from_status,
+    )
+    return len(sent_ids)
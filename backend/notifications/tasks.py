@@ -1,27 +1,37 @@
+import logging
+from datetime import UTC, datetime
+from typing import Any
+
 from celery import shared_task
+from django.conf import settings
 from django.contrib.auth.models import User
-from events.models import Booking, Event
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+from events.models import Event, EventStatus
+from redis import RedisError
 
+from notifications import digest, dispatcher, fanout, outbox, partitions
+from notifications.models import NotificationStatus
 from notifications.services import (
     NotificationService,
     send_fake_notification,
     send_grpc_notification,
+    send_grpc_notifications,
 )
 
 
-@shared_task(name='notifications.tasks.process_pending_notifications')
-def process_pending_notifications() -> str:
-    """Sends all pending notifications."""
-    pending_notifications = NotificationService.get_pending_notifications()
+logger = logging.getLogger(__name__)
 
-    success_count = 0
-    failure_count = 0
 
-    for notification in pending_notifications:
-        if send_fake_notification(notification):
-            success_count += 1
-        else:
-            failure_count += 1
+@shared_task(name='notifications.tasks.process_pending_notifications')
+def process_pending_notifications() -> str:
+    """
+    Sends all pending notifications, several workers can run it
+    at the same time.
+    """
+    success_count, failure_count = dispatcher.dispatch_pending_notifications(
+        settings.NOTIFICATIONS_DISPATCH_CHUNK_SIZE
+    )
 
     return (
         'Processed notifications: '
@@ -33,20 +43,31 @@ def process_pending_notifications() -> str:
 
 @shared_task(name='notifications.tasks.send_booking_confirmation')
 def send_booking_confirmation(booking_id: int) -> bool:
-    try:
-        booking = Booking.objects.select_related('user', 'event').get(
-            id=booking_id
-        )
-    except Booking.DoesNotExist:
+    """Confirms the booking once, a redelivered task sends nothing."""
+    notification = NotificationService.create_booking_confirmation(
+        booking_id, status=NotificationStatus.SENDING
+    )
+    if notification is None:
         return False
-    else:
-        notif = NotificationService.create_booking_confirmation(
-            user=booking.user,
-            event=booking.event,
-            seats=booking.seats,
-        )
-        send_grpc_notification(notif)
-        return True
+    send_grpc_notification(notification, from_status=NotificationStatus.SENDING)
+    return True
+
+
+@shared_task(name='notifications.tasks.send_booking_confirmations')
+def send_booking_confirmations(booking_ids: list[int]) -> int:
+    """
+    Confirms a batch of bookings, returns the number of the sent ones.
+
+    The notifications are created claimed, so the dispatcher never sends
+    them at the same time, the ones of a crashed worker are finished by
+    the dispatcher after the claim expires.
+    """
+    notifications = NotificationService.create_booking_confirmations(
+        booking_ids, status=NotificationStatus.SENDING
+    )
+    return send_grpc_notifications(
+        notifications, from_status=NotificationStatus.SENDING
+    )
 
 
 @shared_task(name='notifications.tasks.send_event_cancelled')
@@ -60,21 +81,170 @@ def send_event_cancelled(user_id: int, event_id: int) -> bool:
     except Exception:
         return False
     else:
-        send_fake_notification(notif)
+        if notif is not None:
+            send_fake_notification(notif)
         return True
 
 
+@shared_task(
+    name='notifications.tasks.send_digest',
+    autoretry_for=(RedisError,),
+    retry_backoff=True,
+    max_retries=5,
+)
+def send_digest(user_id: int) -> int:
+    """
+    Sends the notifications buffered for the user within the window
+    as one, returns their number.
+
+    The buffered notifications are removed after the digest is sent.
+    The digest is keyed by its window, so a retry after a failure
+    in between only removes them. The digest is created claimed,
+    the dispatcher never sends it at the same time.
+    """
+    drafts = digest.get_drafts(user_id)
+    if not drafts:
+        return 0
+    notification = NotificationService.create_digest(
+        user_id, drafts, digest.get_dedup_key(user_id, drafts)
+    )
+    if notification is not None:
+        send_grpc_notifications(
+            [notification], from_status=NotificationStatus.SENDING
+        )
+    digest.remove_drafts(user_id, len(drafts))
+    return len(drafts)
+
+
 @shared_task(name='notifications.tasks.event_reminder')
-def event_reminder(event_id: int) -> bool:
-    event = Event.objects.get(pk=event_id)
-    bookings = Booking.objects.filter(event=event).select_related('user')
+def event_reminder(event_id: int, start_time: str | None = None) -> bool:
+    """
+    Reminds the participants of the upcoming event once.
+
+    The reminder is claimed by setting `reminded_at` with a conditional
+    UPDATE, so the duplicated tasks (the scheduled one, the sweep,
+    a redelivery) send it once. The task scheduled for another
+    `start_time` of the rescheduled event does nothing.
+
+    The participants are notified by the fan-out tasks published
+    with the claim through the outbox.
+    """
+    events = Event.objects.filter(
+        pk=event_id, status=EventStatus.UPCOMING, reminded_at__isnull=True
+    )
+    if start_time:
+        events = events.filter(start_time=datetime.fromisoformat(start_time))
+    with transaction.atomic():
+        if not events.update(reminded_at=timezone.now()):
+            return False
+        reminder = NotificationService.get_event_reminder(
+            Event.objects.get(pk=event_id)
+        )
+        outbox.enqueue(fan_out_notification, reminder._asdict())
+    return True
+
+
+@shared_task(name='notifications.tasks.notify_event_cancelled')
+def notify_event_cancelled(event_id: int) -> int:
+    """
+    Tells all the participants that the event is cancelled, the fan-out
+    chunks skip the ones notified already. Returns the number of the
+    chunk tasks.
+    """
     try:
-        for booking in bookings:
-            notif = NotificationService.create_event_reminder(
-                user=booking.user, event=event
-            )
-            send_fake_notification(notif)
-    except Exception:
-        return False
-    else:
-        return True
+        event = Event.objects.get(pk=event_id)
+    except Event.DoesNotExist:
+        return 0
+    return NotificationService.fan_out_to_participants(
+        NotificationService.get_event_cancellation(event)
+    )
+
+
+@shared_task(name='notifications.tasks.fan_out_notification')
+def fan_out_notification(fan_out: dict[str, Any]) -> int:
+    """Starts the fan-out, returns the number of the chunk tasks."""
+    return NotificationService.fan_out_to_participants(fanout.FanOut(**fan_out))
+
+
+@shared_task(
+    name='notifications.tasks.notify_participants_chunk',
+    acks_late=True,
+    autoretry_for=(DatabaseError,),
+    retry_backoff=True,
+    max_retries=5,
+)
+def notify_participants_chunk(
+    fan_out: dict[str, Any], after_pk: int, last_pk: int
+) -> tuple[int, int]:
+    """
+    Notifies the participants of one chunk of the fan-out, returns
+    the numbers of the sent and failed notifications.
+
+    A retried or redelivered chunk skips the participants notified
+    before. The notifications are claimed while they are sent, the ones
+    of a crashed worker are finished by the dispatcher.
+    """
+    notifications = fanout.create_chunk(
+        fanout.FanOut(**fan_out),
+        after_pk,
+        last_pk,
+        status=NotificationStatus.SENDING,
+    )
+    sent_count = send_grpc_notifications(
+        notifications, from_status=NotificationStatus.SENDING
+    )
+    return sent_count, len(notifications) - sent_count
+
+
+@shared_task(name='notifications.tasks.summarize_fan_out')
+def summarize_fan_out(
+    chunk_results: list[tuple[int, int]], dedup_key: str | None
+) -> dict[str, int]:
+    """Sums up the sent and failed counts of the chunks of the fan-out."""
+    summary = {
+        'chunks': len(chunk_results),
+        'sent': sum(sent_count for sent_count, _ in chunk_results),
+        'failed': sum(failed_count for _, failed_count in chunk_results),
+    }
+    logger.info('Fan-out %s finished: %s', dedup_key, summary)
+    return summary
+
+
+@shared_task(name='notifications.tasks.relay_outbox')
+def relay_outbox() -> str:
+    """Publishes all the committed outbox messages batch by batch."""
+    batch_size = settings.OUTBOX_RELAY_BATCH_SIZE
+    published_count = 0
+    published = batch_size
+    while published == batch_size:
+        published = outbox.relay(batch_size)
+        published_count += published
+    return f'Published {published_count} outbox messages'
+
+
+@shared_task(name='notifications.tasks.maintain_notification_partitions')
+def maintain_notification_partitions() -> str:
+    """
+    Creates the next partitions and drops the expired ones with
+    the delivery attempts of their notifications.
+    """
+    created, dropped = partitions.maintain_partitions()
+    retained_from = partitions.add_months(
+        partitions.month_of(timezone.now()),
+        -settings.NOTIFICATIONS_RETENTION_MONTHS,
+    )
+    NotificationService.delete_attempts(
+        datetime.combine(retained_from, datetime.min.time(), tzinfo=UTC)
+    )
+    return f'Created {len(created)} partitions, dropped {len(dropped)}'
+
+
+@shared_task(name='notifications.tasks.replay_dead_notifications')
+def replay_dead_notifications(limit: int | None = None) -> str:
+    """Replays the dead-lettered notifications at the controlled rate."""
+    sent_count, failed_count = dispatcher.replay_dead_notifications(
+        settings.NOTIFICATIONS_REPLAY_BATCH_SIZE,
+        settings.NOTIFICATIONS_REPLAY_RATE,
+        limit,
+    )
+    return f'Replayed notifications: {sent_count} sent, {failed_count} failed'
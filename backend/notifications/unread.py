@@ -0,0 +1,75 @@
+import logging
+from collections import Counter
+from functools import partial
+
+from config.valkey import get_client
+from django.db import transaction
+from redis import RedisError
+
+from notifications.models import Notification, NotificationStatus
+
+
+logger = logging.getLogger(__name__)
+
+UNREAD_KEY = 'notifications:unread:{user_id}'
+# Bounds the drift of a counter missed by an update (unavailable Valkey,
+# deleted notifications): it is recounted at least once an hour.
+UNREAD_TTL = 3600
+# A missing counter is not created by the updates, it is counted on read.
+INCR_IF_EXISTS = (
+    "if redis.call('EXISTS', KEYS[1]) == 1 then "
+    "return redis.call('INCRBY', KEYS[1], ARGV[1]) end"
+)
+
+
+def get_unread_count(user_id: int) -> int:
+    """
+    Number of the sent but not read notifications of the user.
+
+    It is read from the counter kept in Valkey, the database is counted
+    only when the counter is missing or Valkey is unavailable.
+    """
+    key = UNREAD_KEY.format(user_id=user_id)
+    try:
+        cached = get_client().get(key)
+    except RedisError:
+        logger.warning('Unable to get the unread counter', exc_info=True)
+        return _count_unread(user_id)
+    if cached is not None:
+        return int(cached)  # type: ignore
+    unread_count = _count_unread(user_id)
+    try:
+        get_client().set(key, unread_count, ex=UNREAD_TTL, nx=True)
+    except RedisError:
+        logger.warning('Unable to set the unread counter', exc_info=True)
+    return unread_count
+
+
+def add_unread(deltas: Counter[int]) -> None:
+    """
+    Changes the counters of the users (by user id) when the current
+    transaction commits.
+    """
+    if deltas:
+        transaction.on_commit(partial(_incr_counters, deltas))
+
+
+def _incr_counters(deltas: Counter[int]) -> None:
+    script = get_client().register_script(INCR_IF_EXISTS)
+    try:
+        with get_client().pipeline(transaction=False) as pipeline:
+            for user_id, delta in deltas.items():
+                script(
+                    keys=[UNREAD_KEY.format(user_id=user_id)],
+                    args=[delta],
+                    client=pipeline,
+                )
+            pipeline.execute()
+    except RedisError:
+        logger.warning('Unable to update the unread counters', exc_info=True)
+
+
+def _count_unread(user_id: int) -> int:
+    return Notification.objects.filter(
+        user_id=user_id, status=NotificationStatus.SENT
+    ).count()
@@ -1,3 +1,4 @@
+from config.auth import refresh_access
 from django.http import HttpRequest
 from ninja import Router
 from ninja.errors import HttpError
@@ -79,10 +80,8 @@ def token_refresh(
     Updating an access token using a refresh token.
     """
     try:
-        refresh = RefreshToken(user_data.refresh)  # type: ignore
+        access = refresh_access(user_data.refresh)
     except TokenError as error:
         raise HttpError(400, f'Invalid refresh token: {error}') from error
     else:
-        return AuthTokenOut(
-            access=str(refresh.access_token), refresh=str(refresh)
-        )
+        return AuthTokenOut(access=str(access), refresh=user_data.refresh)
@@ -1,7 +1,24 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
 
 
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'users'
     verbose_name = 'Users'
+
+    def ready(self) -> None:
+        from django.contrib.auth.models import User  # noqa: PLC0415, WPS433
+
+        from users import signals  # noqa: PLC0415, WPS433
+
+        post_save.connect(
+            signals.invalidate_cached_user,
+            sender=User,
+            dispatch_uid='users.cache',
+        )
+        post_delete.connect(
+            signals.invalidate_cached_user,
+            sender=User,
+            dispatch_uid='users.cache',
+        )
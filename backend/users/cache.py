@@ -0,0 +1,166 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from functools import partial
+from typing import Any
+
+from config.valkey import get_client
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import DEFAULT_DB_ALIAS, transaction
+from redis import RedisError
+
+
+logger = logging.getLogger(__name__)
+
+# The hash of the user: its version is bumped by every change of the user,
+# the payload is valid only while it was loaded with the current version.
+USER_KEY = 'auth:user:{user_id}'
+VERSION = 'version'
+PAYLOAD = 'payload'
+PAYLOAD_VERSION = 'payload_version'
+# The fields the cached users are built from, in the order of the model
+# fields as User.from_db expects, the others are deferred and loaded from
+# the database on access.
+USER_FIELDS = (
+    'id',
+    'is_superuser',
+    'username',
+    'first_name',
+    'last_name',
+    'email',
+    'is_staff',
+    'is_active',
+)
+
+Payload = dict[str, Any]
+
+
+class UserCache:
+    """
+    Small LRU of the users resolved by the process.
+
+    An entry is trusted for AUTH_USER_LOCAL_TTL without asking Valkey,
+    so the changes made by the other processes are seen after that time.
+    """
+
+    def __init__(self, size: int, ttl: float) -> None:
+        self._size = size
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._payloads: OrderedDict[int, tuple[float, Payload]] = OrderedDict()
+
+    def get(self, user_id: int) -> Payload | None:
+        with self._lock:
+            entry = self._payloads.get(user_id)
+            if entry is None:
+                return None
+            expires_at, payload = entry
+            if expires_at < time.monotonic():
+                self._payloads.pop(user_id)
+                return None
+            self._payloads.move_to_end(user_id)
+            return payload
+
+    def put(self, user_id: int, payload: Payload) -> None:
+        if self._size <= 0:
+            return
+        with self._lock:
+            self._payloads[user_id] = (time.monotonic() + self._ttl, payload)
+            self._payloads.move_to_end(user_id)
+            while len(self._payloads) > self._size:
+                self._payloads.popitem(last=False)
+
+    def discard(self, user_id: int) -> None:
+        with self._lock:
+            self._payloads.pop(user_id, None)
+
+
+local_users = UserCache(
+    settings.AUTH_USER_CACHE_SIZE, settings.AUTH_USER_LOCAL_TTL
+)
+
+
+def get_user(user_id: int) -> User | None:
+    """
+    The user by its id without a database query in the common case:
+    it is looked up in the LRU of the process, then in Valkey and only
+    then in the database. Returns None if there is no such user.
+    """
+    payload = local_users.get(user_id)
+    if payload is None:
+        payload = _get_payload(user_id)
+        if payload is None:
+            return None
+        local_users.put(user_id, payload)
+    return User.from_db(DEFAULT_DB_ALIAS, list(payload), payload.values())
+
+
+def invalidate_users(user_ids: Iterable[int]) -> None:
+    """
+    Drops the cached users when the current transaction commits: bumps
+    their versions, so the payloads loaded before the change are never
+    used again.
+
+    The saved and deleted users are invalidated by the signals, the code
+    changing the users without them (QuerySet.update(), raw SQL) must
+    call it. The missed changes are seen after AUTH_USER_CACHE_TIMEOUT.
+    """
+    transaction.on_commit(partial(_bump_versions, list(user_ids)))
+
+
+def _get_payload(user_id: int) -> Payload | None:
+    key = USER_KEY.format(user_id=user_id)
+    try:
+        version, payload_version, payload = get_client().hmget(
+            key, [VERSION, PAYLOAD_VERSION, PAYLOAD]
+        )  # type: ignore
+    except RedisError:
+        logger.warning('Unable to read the cached user', exc_info=True)
+        return _load_payload(user_id)
+    version = version or b'0'
+    if payload is not None and payload_version == version:
+        return json.loads(payload)  # type: ignore
+    user_payload = _load_payload(user_id)
+    if user_payload is not None:
+        _cache_payload(key, user_payload, version)
+    return user_payload
+
+
+def _bump_versions(user_ids: list[int]) -> None:
+    for user_id in user_ids:
+        local_users.discard(user_id)
+    try:
+        with get_client().pipeline(transaction=False) as pipeline:
+            for user_id in user_ids:
+                key = USER_KEY.format(user_id=user_id)
+                pipeline.hincrby(key, VERSION, 1)
+                pipeline.expire(key, settings.AUTH_USER_CACHE_TIMEOUT)
+            pipeline.execute()
+    except RedisError:
+        logger.exception('Unable to invalidate the cached users %s', user_ids)
+
+
+def _load_payload(user_id: int) -> Payload | None:
+    return User.objects.filter(pk=user_id).values(*USER_FIELDS).first()
+
+
+def _cache_payload(key: str, payload: Payload, version: bytes) -> None:
+    # A change committed meanwhile has bumped the version already,
+    # so the payload read before it is stored as an outdated one.
+    try:
+        with get_client().pipeline(transaction=False) as pipeline:
+            pipeline.hset(
+                key,
+                mapping={
+                    PAYLOAD: json.dumps(payload),
+                    PAYLOAD_VERSION: version,
+                },
+            )
+            pipeline.expire(key, settings.AUTH_USER_CACHE_TIMEOUT)
+            pipeline.execute()
+    except RedisError:
+        logger.warning('Unable to cache the user', exc_info=True)
@@ -0,0 +1,19 @@
+from typing import Any
+
+from django.contrib.auth.models import User
+
+from users import cache
+
+
+# Saved on every login, it is not cached so it doesn't invalidate the user.
+IGNORED_FIELDS = frozenset(('last_login',))
+
+
+def invalidate_cached_user(
+    sender: type[User], instance: User, **kwargs: Any
+) -> None:
+    """Invalidates the cached user once its change is committed."""
+    update_fields = kwargs.get('update_fields')
+    if update_fields and IGNORED_FIELDS.issuperset(update_fields):
+        return
+    cache.invalidate_users([instance.pk])
@@ -17,7 +17,24 @@ if [ "$1" == 'runserver' ]; then
     config.wsgi:application 
 elif [ "$1" == 'celery-worker' ]; then
     cd /opt/app
-    exec gosu unprivileged python -m celery -A config worker
+    # celery-worker [urgent|bulk|maintenance]: the worker of one lane,
+    # all the queues without it.
+    case "$2" in
+        urgent)
+            # The confirmations: a message at a time, never behind a long task.
+            WORKER_OPTIONS="-Q urgent -c ${CELERY_URGENT_CONCURRENCY:-4} --prefetch-multiplier 1 -O fair"
+            ;;
+        bulk)
+            WORKER_OPTIONS="-Q bulk -c ${CELERY_BULK_CONCURRENCY:-8} --prefetch-multiplier 4"
+            ;;
+        maintenance)
+            WORKER_OPTIONS="-Q default,maintenance -c 2 --prefetch-multiplier 1"
+            ;;
+        *)
+            WORKER_OPTIONS=""
+            ;;
+    esac
+    exec gosu unprivileged python -m celery -A config worker $WORKER_OPTIONS
 elif [ "$1" == 'celery-beat' ]; then
     cd /opt/app
     exec gosu unprivileged python -m celery -A config beat
@@ -0,0 +1,57 @@
+import importlib
+import logging
+from types import MappingProxyType
+
+import notyfy_pb2
+
+
+logger = logging.getLogger('NotificationServer')
+
+DELIVERED = 'The notification was received successfully'
+
+
+def log_notification(notification):
+    logger.info(
+        'Notification %s to the user %s (%s): %s',
+        notification.id,
+        notification.user_id,
+        notyfy_pb2.NotificationType.Name(notification.type),
+        notification.title,
+    )
+
+
+class LogBackend:
+    """Delivers the notifications to the log, one line per notification."""
+
+    async def deliver(self, notification):
+        log_notification(notification)
+        return True, DELIVERED
+
+
+class NullBackend:
+    """Accepts the notifications without any work, for the load tests."""
+
+    async def deliver(self, notification):
+        return True, DELIVERED
+
+
+BACKENDS = MappingProxyType({
+    'log': LogBackend,
+    'null': NullBackend,
+})
+
+
+def load_backend(name):
+    """
+    Backend by its name or by the `module:Class` path of a custom one.
+
+    A backend has the `async deliver(notification) -> (success, message)`
+    method, it is called concurrently by the workers of the server.
+    """
+    backend_class = BACKENDS.get(name)
+    if backend_class is None:
+        module_name, _, class_name = name.partition(':')
+        backend_class = getattr(
+            importlib.import_module(module_name), class_name
+        )
+    return backend_class()
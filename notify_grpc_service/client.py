@@ -42,5 +42,39 @@ def send_notification_grpc():
             )
 
 
+def send_notifications_grpc(count=3):
+    channel = grpc.insecure_channel('localhost:50051')
+    stub = notyfy_pb2_grpc.NotificationSenderStub(channel)
+
+    notifications = (
+        notyfy_pb2.Notification(
+            id=index,
+            user_id=456,
+            type=notyfy_pb2.NotificationType.EVENT_REMINDER,
+            title='Event Reminder',
+            message='You have an event scheduled for tomorrow at 10:00',
+        )
+        for index in range(1, count + 1)
+    )
+
+    logger.info('Streaming %s notifications', count)
+    try:
+        response = stub.send_notifications(notifications)
+    except grpc.RpcError as error:
+        logger.info(
+            'Error when calling RPC: %s: %s', error.code(), error.details()
+        )
+    else:
+        logger.info('Received: %s', response.received)
+        for status in response.statuses:
+            logger.info(
+                'Notification %s: %s (%s)',
+                status.id,
+                status.success,
+                status.message,
+            )
+
+
 if __name__ == '__main__':
     send_notification_grpc()
+    send_notifications_grpc()
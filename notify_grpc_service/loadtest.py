@@ -0,0 +1,89 @@
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+from collections import Counter
+
+import grpc
+import notyfy_pb2
+import notyfy_pb2_grpc
+
+
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+logger = logging.getLogger('LoadTest')
+
+
+class LoadStats:
+    """Latencies of the successful calls and the codes of the failed ones."""
+
+    def __init__(self):
+        self.latencies = []
+        self.failures = Counter()
+        self.started = time.perf_counter()
+
+    def report(self):
+        """Logs the throughput and the latency percentiles."""
+        elapsed = time.perf_counter() - self.started
+        sent_count = len(self.latencies)
+        logger.info(
+            'sent: %s in %.2f s (%.0f/s), failed: %s',
+            sent_count,
+            elapsed,
+            sent_count / elapsed,
+            dict(self.failures),
+        )
+        if sent_count > 1:
+            percentiles = statistics.quantiles(self.latencies, n=100)
+            logger.info(
+                'p50: %.2f ms, p99: %.2f ms, max: %.2f ms',
+                percentiles[49],
+                percentiles[98],
+                max(self.latencies),
+            )
+
+
+async def send_one(stub, semaphore, notification_id, stats):
+    notification = notyfy_pb2.Notification(
+        id=notification_id,
+        user_id=notification_id,
+        type=notyfy_pb2.NotificationType.EVENT_REMINDER,
+        title='Load test',
+        message='The event will start in an hour',
+    )
+    async with semaphore:
+        started = time.perf_counter()
+        try:
+            await stub.send_notification(notification, timeout=10)
+        except grpc.aio.AioRpcError as error:
+            stats.failures[error.code().name] += 1
+        else:
+            stats.latencies.append((time.perf_counter() - started) * 1000)
+
+
+async def run(options):
+    semaphore = asyncio.Semaphore(options.concurrency)
+    async with grpc.aio.insecure_channel(options.target) as channel:
+        stub = notyfy_pb2_grpc.NotificationSenderStub(channel)
+        stats = LoadStats()
+        await asyncio.gather(
+            *(
+                send_one(stub, semaphore, index, stats)
+                for index in range(1, options.requests + 1)
+            )
+        )
+    stats.report()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Load test of the notification gRPC server'
+    )
+    parser.add_argument('--target', default='localhost:50051')
+    parser.add_argument('--requests', type=int, default=10000)
+    parser.add_argument('--concurrency', type=int, default=200)
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    asyncio.run(run(parse_args()))
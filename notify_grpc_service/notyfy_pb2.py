@@ -24,19 +24,23 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0cnotyfy.proto\x12\x14notification_service\"\x81\x01\n\x0cNotification\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x0f\n\x07user_id\x18\x02 \x01(\x05\x12\x34\n\x04type\x18\x03 \x01(\x0e\x32&.notification_service.NotificationType\x12\r\n\x05title\x18\x04 \x01(\t\x12\x0f\n\x07message\x18\x05 \x01(\t\"r\n\x14NotificationResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x38\n\x0cnotification\x18\x03 \x01(\x0b\x32\".notification_service.Notification*h\n\x10NotificationType\x12\x12\n\x0e\x45VENT_REMINDER\x10\x00\x12\x18\n\x14\x42OOKING_CONFIRMATION\x10\x01\x12\x13\n\x0f\x45VENT_CANCELLED\x10\x02\x12\x11\n\rEVENT_UPDATED\x10\x03\x32{\n\x12NotificationSender\x12\x65\n\x11send_notification\x12\".notification_service.Notification\x1a*.notification_service.NotificationResponse\"\x00\x62\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0cnotyfy.proto\x12\x14notification_service\"\x81\x01\n\x0cNotification\x12\n\n\x02id\x18\x01 \x01(\x03\x12\x0f\n\x07user_id\x18\x02 \x01(\x03\x12\x34\n\x04type\x18\x03 \x01(\x0e\x32&.notification_service.NotificationType\x12\r\n\x05title\x18\x04 \x01(\t\x12\x0f\n\x07message\x18\x05 \x01(\t\"r\n\x14NotificationResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x38\n\x0cnotification\x18\x03 \x01(\x0b\x32\".notification_service.Notification\">\n\x0e\x44\x65liveryStatus\x12\n\n\x02id\x18\x01 \x01(\x03\x12\x0f\n\x07success\x18\x02 \x01(\x08\x12\x0f\n\x07message\x18\x03 \x01(\t\"Y\n\rBatchResponse\x12\x10\n\x08received\x18\x01 \x01(\x05\x12\x36\n\x08statuses\x18\x02 \x03(\x0b\x32$.notification_service.DeliveryStatus*t\n\x10NotificationType\x12\x12\n\x0e\x45VENT_REMINDER\x10\x00\x12\x18\n\x14\x42OOKING_CONFIRMATION\x10\x01\x12\x13\n\x0f\x45VENT_CANCELLED\x10\x02\x12\x11\n\rEVENT_UPDATED\x10\x03\x12\n\n\x06\x44IGEST\x10\x04\x32\xde\x01\n\x12NotificationSender\x12\x65\n\x11send_notification\x12\".notification_service.Notification\x1a*.notification_service.NotificationResponse\"\x00\x12\x61\n\x12send_notifications\x12\".notification_service.Notification\x1a#.notification_service.BatchResponse\"\x00(\x01\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'notyfy_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
-  _globals['_NOTIFICATIONTYPE']._serialized_start=286
-  _globals['_NOTIFICATIONTYPE']._serialized_end=390
+  _globals['_NOTIFICATIONTYPE']._serialized_start=441
+  _globals['_NOTIFICATIONTYPE']._serialized_end=557
   _globals['_NOTIFICATION']._serialized_start=39
   _globals['_NOTIFICATION']._serialized_end=168
   _globals['_NOTIFICATIONRESPONSE']._serialized_start=170
   _globals['_NOTIFICATIONRESPONSE']._serialized_end=284
-  _globals['_NOTIFICATIONSENDER']._serialized_start=392
-  _globals['_NOTIFICATIONSENDER']._serialized_end=515
+  _globals['_DELIVERYSTATUS']._serialized_start=286
+  _globals['_DELIVERYSTATUS']._serialized_end=348
+  _globals['_BATCHRESPONSE']._serialized_start=350
+  _globals['_BATCHRESPONSE']._serialized_end=439
+  _globals['_NOTIFICATIONSENDER']._serialized_start=560
+  _globals['_NOTIFICATIONSENDER']._serialized_end=782
 # @@protoc_insertion_point(module_scope)
@@ -39,6 +39,11 @@ class NotificationSenderStub(object):
                 request_serializer=notyfy__pb2.Notification.SerializeToString,
                 response_deserializer=notyfy__pb2.NotificationResponse.FromString,
                 _registered_method=True)
+        self.send_notifications = channel.stream_unary(
+                '/notification_service.NotificationSender/send_notifications',
+                request_serializer=notyfy__pb2.Notification.SerializeToString,
+                response_deserializer=notyfy__pb2.BatchResponse.FromString,
+                _registered_method=True)
 
 
 class NotificationSenderServicer(object):
@@ -50,6 +55,12 @@ class NotificationSenderServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def send_notifications(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_NotificationSenderServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -58,6 +69,11 @@ def add_NotificationSenderServicer_to_server(servicer, server):
                     request_deserializer=notyfy__pb2.Notification.FromString,
                     response_serializer=notyfy__pb2.NotificationResponse.SerializeToString,
             ),
+            'send_notifications': grpc.stream_unary_rpc_method_handler(
+                    servicer.send_notifications,
+                    request_deserializer=notyfy__pb2.Notification.FromString,
+                    response_serializer=notyfy__pb2.BatchResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'notification_service.NotificationSender', rpc_method_handlers)
@@ -95,3 +111,30 @@ class NotificationSender(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def send_notifications(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_unary(
+            request_iterator,
+            target,
+            '/notification_service.NotificationSender/send_notifications',
+            notyfy__pb2.Notification.SerializeToString,
+            notyfy__pb2.BatchResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
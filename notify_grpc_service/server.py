@@ -1,46 +1,240 @@
+import argparse
+import asyncio
+import atexit
 import logging
+import os
+import queue
 from concurrent import futures
+from itertools import starmap
+from logging.handlers import QueueHandler, QueueListener
 
 import grpc
 import notyfy_pb2
 import notyfy_pb2_grpc
+from backends import DELIVERED, load_backend, log_notification
 
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s | %(message)s',
-    handlers=[logging.StreamHandler()],
-)
 logger = logging.getLogger('NotificationServer')
 
+SERVER_OPTIONS = (
+    # The clients keep their idle channels alive with pings.
+    ('grpc.keepalive_permit_without_calls', 1),
+    ('grpc.http2.min_ping_interval_without_data_ms', 10000),
+    ('grpc.http2.max_ping_strikes', 0),
+)
+
+
+def setup_logging():
+    """
+    The log records are written by a separate thread, so the handlers
+    of the notifications never wait for the output.
+    """
+    records = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter('%(asctime)s | %(message)s'))
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(message)s',
+        handlers=[QueueHandler(records)],
+    )
+    listener = QueueListener(records, stream_handler)
+    listener.start()
+    atexit.register(listener.stop)
+
 
 class NotificationServicer(notyfy_pb2_grpc.NotificationSenderServicer):
     def send_notification(self, request, context):
-        logger.info('=== Notification received ===')
-        logger.info('ID: %s', request.id)
-        logger.info('User ID: %s', request.user_id)
-        logger.info('Type: %s', notyfy_pb2.NotificationType.Name(request.type))
-        logger.info('Title: %s', request.title)
-        logger.info('Message: %s', request.message)
-        logger.info('===========================')
+        log_notification(request)
 
         return notyfy_pb2.NotificationResponse(
             success=True,
-            message='The notification was received successfully',
+            message=DELIVERED,
             notification=request,
         )
 
+    def send_notifications(self, request_iterator, context):
+        """Receives a stream of notifications, reports every one of them."""
+        statuses = []
+        for notification in request_iterator:
+            log_notification(notification)
+            statuses.append(
+                notyfy_pb2.DeliveryStatus(
+                    id=notification.id, success=True, message=DELIVERED
+                )
+            )
+        logger.info('Batch of %s notifications received', len(statuses))
+
+        return notyfy_pb2.BatchResponse(
+            received=len(statuses),
+            statuses=statuses,
+        )
+
+
+class Dispatcher:
+    """
+    Bounded queue of the notifications served by a pool of workers.
+
+    A full queue means the backend doesn't keep up with the load,
+    the new notifications are rejected instead of waiting in memory.
+    """
 
-def serve():
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
+    def __init__(self, backend, workers, queue_size):
+        self._backend = backend
+        self._workers_count = workers
+        self._queue = asyncio.Queue(maxsize=queue_size)
+        self._workers = []
+
+    def start(self):
+        self._workers = [
+            asyncio.create_task(self._work())
+            for _ in range(self._workers_count)
+        ]
+
+    async def stop(self):
+        await self._queue.join()
+        for worker in self._workers:
+            worker.cancel()
+
+    def submit(self, notification):
+        """
+        Queues the notification, returns the future of the delivery.
+        Raises asyncio.QueueFull if the queue is full.
+        """
+        delivery = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((notification, delivery))
+        return delivery
+
+    async def submit_wait(self, notification):
+        """Queues the notification waiting for a free place."""
+        delivery = asyncio.get_running_loop().create_future()
+        await self._queue.put((notification, delivery))
+        return delivery
+
+    async def _work(self):
+        while True:
+            notification, delivery = await self._queue.get()
+            try:
+                delivered = await self._backend.deliver(notification)
+            except Exception as error:
+                logger.exception('Unable to deliver %s', notification.id)
+                delivered = (False, str(error))
+            if not delivery.done():
+                delivery.set_result(delivered)
+            self._queue.task_done()
+
+
+class AsyncNotificationServicer(notyfy_pb2_grpc.NotificationSenderServicer):
+    def __init__(self, dispatcher):
+        self._dispatcher = dispatcher
+
+    async def send_notification(self, request, context):
+        """Rejects with RESOURCE_EXHAUSTED when the queue is full."""
+        try:
+            delivery = self._dispatcher.submit(request)
+        except asyncio.QueueFull:
+            await context.abort(
+                grpc.StatusCode.RESOURCE_EXHAUSTED,
+                'The notification queue is full, retry later',
+            )
+        success, message = await delivery
+
+        return notyfy_pb2.NotificationResponse(
+            success=success,
+            message=message,
+            notification=request,
+        )
+
+    async def send_notifications(self, request_iterator, context):
+        """
+        Receives a stream of notifications, reports every one of them.
+
+        The stream is not rejected: it is read as fast as the queue frees,
+        so the HTTP/2 flow control slows the client down.
+        """
+        deliveries = {}
+        async for notification in request_iterator:
+            deliveries[notification.id] = await self._dispatcher.submit_wait(
+                notification
+            )
+        logger.info('Batch of %s notifications received', len(deliveries))
+
+        return notyfy_pb2.BatchResponse(
+            received=len(deliveries),
+            statuses=await asyncio.gather(
+                *starmap(self._get_status, deliveries.items())
+            ),
+        )
+
+    async def _get_status(self, notification_id, delivery):
+        success, message = await delivery
+        return notyfy_pb2.DeliveryStatus(
+            id=notification_id, success=success, message=message
+        )
+
+
+def serve(options):
+    server = grpc.server(
+        futures.ThreadPoolExecutor(max_workers=options.workers),
+        options=SERVER_OPTIONS,
+    )
     notyfy_pb2_grpc.add_NotificationSenderServicer_to_server(
         NotificationServicer(), server
     )
-    server.add_insecure_port('[::]:50051')
+    server.add_insecure_port(f'[::]:{options.port}')
     server.start()
-    logger.info('The debug gRPC server is running on the port 50051')
+    logger.info('The debug gRPC server is running on the port %s', options.port)
     server.wait_for_termination()
 
 
+async def serve_aio(options):
+    dispatcher = Dispatcher(
+        load_backend(options.backend), options.workers, options.queue_size
+    )
+    server = grpc.aio.server(
+        options=SERVER_OPTIONS,
+        maximum_concurrent_rpcs=options.max_concurrent_rpcs,
+    )
+    notyfy_pb2_grpc.add_NotificationSenderServicer_to_server(
+        AsyncNotificationServicer(dispatcher), server
+    )
+    server.add_insecure_port(f'[::]:{options.port}')
+    dispatcher.start()
+    await server.start()
+    logger.info(
+        'The async gRPC server is running on the port %s '
+        '(backend: %s, workers: %s, queue: %s)',
+        options.port,
+        options.backend,
+        options.workers,
+        options.queue_size,
+    )
+    await server.wait_for_termination()
+    await dispatcher.stop()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Notification gRPC server')
+    parser.add_argument(
+        '--mode',
+        choices=('aio', 'sync'),
+        default=os.environ.get('NOTIFY_SERVER_MODE', 'aio'),
+    )
+    parser.add_argument('--port', type=int, default=50051)
+    parser.add_argument(
+        '--backend',
+        default=os.environ.get('NOTIFY_BACKEND', 'log'),
+        help='log, null or the module:Class path of a custom backend',
+    )
+    parser.add_argument('--workers', type=int, default=10)
+    parser.add_argument('--queue-size', type=int, default=10000)
+    parser.add_argument('--max-concurrent-rpcs', type=int, default=None)
+    return parser.parse_args()
+
+
 if __name__ == '__main__':
-    serve()
+    arguments = parse_args()
+    setup_logging()
+    if arguments.mode == 'sync':
+        serve(arguments)
+    else:
+        asyncio.run(serve_aio(arguments))